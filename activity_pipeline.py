@@ -0,0 +1,108 @@
+"""
+🍃 Activity Pipeline
+Buffers activity_log events in memory: routine sync heartbeats collapse into
+one summary row per interval, while real transitions (agent working -> idle,
+cron job failing) are kept as individual rows. Rows leave in batches.
+"""
+
+import time
+from datetime import datetime
+
+# ======== Configuration ========
+DEFAULT_SUMMARY_SECONDS = 15 * 60  # one sync_summary row per interval
+DEFAULT_FLUSH_SECONDS = 60         # max time an event waits in memory
+DEFAULT_FLUSH_SIZE = 100           # flush early once this many rows are buffered
+
+def activity_row(activity_type, description, agent_name="", metadata=None, recorded_at=None):
+    """Build an activity_log row"""
+    return {
+        "agent_name": agent_name,
+        "activity_type": activity_type,
+        "description": description,
+        "metadata": metadata or {},
+        "recorded_at": (recorded_at or datetime.now()).isoformat(),
+    }
+
+class ActivityPipeline:
+    """Turns per-cycle observations into a small stream of activity_log rows"""
+
+    def __init__(self, summary_seconds=DEFAULT_SUMMARY_SECONDS, flush_seconds=DEFAULT_FLUSH_SECONDS,
+                 flush_size=DEFAULT_FLUSH_SIZE):
+        self.summary_seconds = summary_seconds
+        self.flush_seconds = flush_seconds
+        self.flush_size = flush_size
+        self.cron_states = {}     # job_id -> (last_status, consecutive_errors)
+        self.pending = []
+        self.summary = None
+        self.last_flush = time.monotonic()
+
+    # ======== Transitions ========
+    def observe(self, transitions, jobs):
+        """Queue a row for every agent status change and cron failure/recovery"""
+        for transition in transitions:
+            name, previous, current = transition["agent_name"], transition["from_status"], transition["to_status"]
+            if previous is not None:
+                self.pending.append(activity_row(
+                    "status_change", f"{name[:30]}: {previous} → {current}", name,
+                    {"from": previous, "to": current, "task": transition.get("task_name", "")},
+                ))
+
+        for job in jobs:
+            job_id = job["job_id"]
+            state = (job.get("last_status", ""), job.get("consecutive_errors", 0) or 0)
+            previous = self.cron_states.get(job_id)
+            self.cron_states[job_id] = state
+            if previous is None or previous == state:
+                continue
+            metadata = {"job_id": job_id, "from": previous[0], "to": state[0], "consecutive_errors": state[1]}
+            if state[0] == "error" and (previous[0] != "error" or state[1] > previous[1]):
+                self.pending.append(activity_row("cron_failed", f"{job.get('name', job_id)} failed ({state[1]} in a row)", metadata=metadata))
+            elif previous[0] == "error" and state[0] == "ok":
+                self.pending.append(activity_row("cron_recovered", f"{job.get('name', job_id)} recovered", metadata=metadata))
+
+    # ======== Sync Heartbeats ========
+    def record_sync(self, duration_ms, agents, jobs, rows_changed):
+        """Fold one sync cycle into the current summary interval"""
+        if self.summary is None:
+            self.summary = {"started_at": datetime.now(), "cycles": 0, "total_ms": 0.0, "max_ms": 0.0, "rows_changed": 0}
+        summary = self.summary
+        summary["cycles"] += 1
+        summary["total_ms"] += duration_ms
+        summary["max_ms"] = max(summary["max_ms"], duration_ms)
+        summary["rows_changed"] += rows_changed
+        summary["agents"] = agents
+        summary["cron_jobs"] = jobs
+
+    def _close_summary(self):
+        summary = self.summary
+        self.summary = None
+        ended_at = datetime.now()
+        self.pending.append(activity_row(
+            "sync_summary",
+            f"{summary['cycles']} syncs, {summary['rows_changed']} rows changed",
+            metadata={
+                "interval_start": summary["started_at"].isoformat(),
+                "interval_end": ended_at.isoformat(),
+                "cycles": summary["cycles"],
+                "avg_duration_ms": round(summary["total_ms"] / summary["cycles"], 1),
+                "max_duration_ms": round(summary["max_ms"], 1),
+                "rows_changed": summary["rows_changed"],
+                "agents": summary["agents"],
+                "cron_jobs": summary["cron_jobs"],
+            },
+            recorded_at=ended_at,
+        ))
+
+    # ======== Flushing ========
+    def drain(self, force=False):
+        """Rows ready to write now (everything, including a partial summary, if forced)"""
+        if self.summary and (force or (datetime.now() - self.summary["started_at"]).total_seconds() >= self.summary_seconds):
+            self._close_summary()
+
+        due = time.monotonic() - self.last_flush >= self.flush_seconds
+        if not self.pending or not (force or due or len(self.pending) >= self.flush_size):
+            return []
+
+        rows, self.pending = self.pending, []
+        self.last_flush = time.monotonic()
+        return rows
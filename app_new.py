@@ -9,11 +9,21 @@ import json
 import time
 import os
 import random
-from datetime import datetime, timedelta
+import threading
+from datetime import datetime, timedelta, timezone
+from itertools import takewhile
 from pathlib import Path
 from supabase import create_client
 from dotenv import load_dotenv
 import hashlib
+import html
+from realtime_listener import RealtimeListener, RealtimeStore, realtime_url
+from snapshot_store import SnapshotStore
+from file_cache import FileCache
+from session_index import read_session_index
+from office_records import IDLE_WINDOW_MS, WORKING_WINDOW_MS, agent_batch, classify_cron, cron_batch, cron_status_codes
+from cron_schedule import DRIFT_TOLERANCE_SECONDS, fire_times, schedule_drift_seconds
+from cron_forecast import forecast_load
 
 # Load environment variables
 load_dotenv()
@@ -23,6 +33,15 @@ SUPABASE_URL = os.getenv("SUPABASE_URL", "")
 SUPABASE_KEY = os.getenv("SUPABASE_KEY", "")
 OPENCLAW_SESSIONS_DIR = Path("/home/node/.openclaw/agents/main/sessions")
 OPENCLAW_CRON_DIR = Path("/home/node/.openclaw/cron")
+ACTIVITY_WINDOW_DAYS = 7  # activity feed only looks this far back
+DELTA_FETCH = os.getenv("DASHBOARD_DELTA_FETCH", "1") != "0"  # only pull rows updated since last poll
+DELTA_OVERLAP_SECONDS = 60   # re-read this much before last_seen to catch late commits
+FULL_RESYNC_SECONDS = 300    # full reload now and then so deleted rows disappear
+REALTIME = os.getenv("DASHBOARD_REALTIME", "0") == "1"  # push changes over Supabase Realtime instead of polling
+SUPABASE_REALTIME_URL = os.getenv("SUPABASE_REALTIME_URL", "")  # override, e.g. a local ws:// stand-in
+SNAPSHOT_REFRESH_SECONDS = float(os.getenv("DASHBOARD_REFRESH_SECONDS", "10"))  # shared data rebuilt this often
+MANUAL_REFRESH_WAIT_SECONDS = 5  # "Refresh Now" waits this long for the rebuild before rerunning
+REALTIME_CHECK_SECONDS = 1   # realtime mode: how often the refresher looks for pushed changes
 
 # ======== Page Config ========
 st.set_page_config(
@@ -445,6 +464,67 @@ st.markdown("""
         font-family: monospace;
         font-size: 0.75rem;
     }
+    
+    /* Next 24h timeline */
+    .timeline-row {
+        display: flex;
+        align-items: center;
+        margin: 6px 0;
+    }
+    
+    .timeline-label {
+        width: 180px;
+        font-size: 0.8rem;
+        white-space: nowrap;
+        overflow: hidden;
+        text-overflow: ellipsis;
+    }
+    
+    .timeline-track {
+        position: relative;
+        flex: 1;
+        height: 14px;
+        background: #FFF0F5;
+        border-radius: 7px;
+    }
+    
+    .timeline-dot {
+        position: absolute;
+        top: 3px;
+        width: 8px;
+        height: 8px;
+        margin-left: -4px;
+        border-radius: 50%;
+        background: #FF6B9D;
+    }
+    
+    .timeline-drift {
+        margin-left: 8px;
+        font-size: 0.75rem;
+        color: #E74C3C;
+    }
+    
+    /* Cron load heatmap */
+    .load-heatmap {
+        border-collapse: separate;
+        border-spacing: 2px;
+        font-size: 0.7rem;
+        width: 100%;
+    }
+    
+    .load-heatmap td {
+        text-align: center;
+        border-radius: 4px;
+        padding: 4px 0;
+        color: #555;
+    }
+    
+    .load-heatmap th {
+        font-weight: normal;
+        color: #999;
+        white-space: nowrap;
+        padding-right: 6px;
+    }
 </style>
 
 <!-- Sakura Petals -->
@@ -511,51 +591,215 @@ def get_work_animation(status):
     }
     return animations.get(status, "")
 
+def format_time(value):
+    """HH:MM today, MM-DD HH:MM otherwise, from an ISO string or epoch ms"""
+    if not value:
+        return "—"
+    when = datetime.fromtimestamp(value / 1000) if isinstance(value, (int, float)) else datetime.fromisoformat(value).astimezone()
+    return when.strftime("%H:%M") if when.date() == datetime.now().date() else when.strftime("%m-%d %H:%M")
+
 # ======== Data Fetching Functions ========
-@st.cache_data(ttl=10)
+# Only the columns the cards and lists render; heavy fields load on demand
+AGENT_COLUMNS = "id,agent_name,status,task_name,started_at,updated_at"
+CRON_COLUMNS = ("id,job_id,name,enabled,schedule_expr,timezone,session_target,last_run_at,"
+                "last_status,last_duration_ms,consecutive_errors,next_run_at,model,updated_at")
+AGENT_DETAIL_COLUMNS = "details"
+CRON_DETAIL_COLUMNS = "payload_message,wake_mode,delivery_mode,delivery_channel,delivery_target"
+PAGE_SIZE = 500
+
+def fetch_pages(table, columns, page_size=PAGE_SIZE, since=None):
+    """Fetch a whole table (or rows updated since `since`) in (updated_at, id) keyset pages"""
+    rows = []
+    last = None
+    while True:
+        query = supabase.table(table).select(columns).order("updated_at").order("id").limit(page_size)
+        if since:
+            query = query.gte("updated_at", since)
+        if last:
+            # Values are quoted: timestamps contain ':' and '+', which PostgREST filters reserve
+            query = query.or_(
+                f'updated_at.gt."{last["updated_at"]}",'
+                f'and(updated_at.eq."{last["updated_at"]}",id.gt.{last["id"]})'
+            )
+        page = query.execute().data or []
+        rows.extend(page)
+        if len(page) < page_size:
+            return rows
+        last = page[-1]
+
+class TableSnapshot:
+    """Per-process copy of a table keyed by id, kept current with delta fetches"""
+
+    def __init__(self, table, columns):
+        self.table = table
+        self.columns = columns
+        self.rows = {}
+        self.last_seen = None
+        self.last_full_sync = 0.0
+        self.lock = threading.Lock()
+
+    def refresh(self):
+        """Merge rows updated since the last poll; reload everything every FULL_RESYNC_SECONDS"""
+        with self.lock:
+            if self.last_seen is None or time.monotonic() - self.last_full_sync >= FULL_RESYNC_SECONDS:
+                self.rows = {row["id"]: row for row in fetch_pages(self.table, self.columns)}
+                self.last_full_sync = time.monotonic()
+            else:
+                since = self.last_seen - timedelta(seconds=DELTA_OVERLAP_SECONDS)
+                for row in fetch_pages(self.table, self.columns, since=since.isoformat()):
+                    self.rows[row["id"]] = row
+
+            seen = [datetime.fromisoformat(row["updated_at"]) for row in self.rows.values() if row.get("updated_at")]
+            self.last_seen = max(seen) if seen else None
+            return list(self.rows.values())
+
+@st.cache_resource
+def get_table_snapshot(table, columns):
+    """One snapshot per table, shared by every session in this process"""
+    return TableSnapshot(table, columns)
+
+def fetch_table(table, columns):
+    """Rows of `table`, via the delta snapshot unless DASHBOARD_DELTA_FETCH=0"""
+    if DELTA_FETCH:
+        return get_table_snapshot(table, columns).refresh()
+    return fetch_pages(table, columns)
+
+# Called from the snapshot refresher thread, so errors are printed, not st.error()
 def fetch_agent_status_from_supabase():
     """Fetch real agent status from Supabase"""
     if not supabase:
         return None
     try:
-        result = supabase.table("agent_status").select("*").execute()
-        return result.data
+        return fetch_table("agent_status", AGENT_COLUMNS)
     except Exception as e:
-        st.error(f"Error fetching agents: {e}")
+        print(f"⚠️  Error fetching agents: {e}")
         return None
 
-@st.cache_data(ttl=10)
 def fetch_cron_jobs_from_supabase():
     """Fetch real cron jobs from Supabase"""
     if not supabase:
         return None
     try:
-        result = supabase.table("cron_jobs").select("*").execute()
-        return result.data
+        return fetch_table("cron_jobs", CRON_COLUMNS)
+    except Exception as e:
+        print(f"⚠️  Error fetching cron jobs: {e}")
+        return None
+
+@st.cache_data(ttl=60)
+def fetch_agent_details_from_supabase(agent_name):
+    """Fetch the details JSONB for one agent (when its card is expanded)"""
+    if not supabase:
+        return None
+    try:
+        result = supabase.table("agent_status").select(AGENT_DETAIL_COLUMNS).eq("agent_name", agent_name).limit(1).execute()
+        return result.data[0] if result.data else None
+    except Exception as e:
+        st.error(f"Error fetching agent details: {e}")
+        return None
+
+@st.cache_data(ttl=60)
+def fetch_cron_job_details_from_supabase(job_id):
+    """Fetch payload text and delivery settings for one cron job (when expanded)"""
+    if not supabase:
+        return None
+    try:
+        result = supabase.table("cron_jobs").select(CRON_DETAIL_COLUMNS).eq("job_id", job_id).limit(1).execute()
+        return result.data[0] if result.data else None
     except Exception as e:
-        st.error(f"Error fetching cron jobs: {e}")
+        st.error(f"Error fetching cron job details: {e}")
         return None
 
+def query_recent_activity(limit=10, window_days=ACTIVITY_WINDOW_DAYS):
+    """Newest activity_log rows, bounded by recorded_at so Postgres skips older monthly partitions"""
+    since = (datetime.now() - timedelta(days=window_days)).isoformat()
+    result = supabase.table("activity_log").select("*").gte("recorded_at", since).order("recorded_at", desc=True).limit(limit).execute()
+    return result.data
+
 @st.cache_data(ttl=10)
-def fetch_recent_activity_from_supabase(limit=10):
+def fetch_recent_activity_from_supabase(limit=10, window_days=ACTIVITY_WINDOW_DAYS):
     """Fetch recent activity from Supabase"""
     if not supabase:
         return None
     try:
-        result = supabase.table("activity_log").select("*").order("recorded_at", desc=True).limit(limit).execute()
-        return result.data
+        return query_recent_activity(limit, window_days)
     except Exception as e:
         st.error(f"Error fetching activity: {e}")
         return None
 
+def fetch_dashboard_counters_from_supabase():
+    """Fetch every sidebar counter as one row from the dashboard_counters view"""
+    if not supabase:
+        return None
+    try:
+        result = supabase.table("dashboard_counters").select("*").limit(1).execute()
+        return result.data[0] if result.data else None
+    except Exception as e:
+        print(f"⚠️  Error fetching counters: {e}")
+        return None
+
+AGENT_COUNTERS = ["total_agents", "active_count", "idle_count", "busy_count"]
+CRON_COUNTERS = ["total_crons", "running_crons", "enabled_crons", "pending_crons", "failed_crons"]
+
+STATUS_ALIASES = {"active": "working", "busy": "failed"}  # older status names, counted as dashboard_counters does
+
+def count_agent_rows(rows):
+    """Per-status counts of agent_status rows (the sync daemon already classified them)"""
+    counts = {}
+    for row in rows:
+        status = STATUS_ALIASES.get(row.get("status"), row.get("status"))
+        counts[status] = counts.get(status, 0) + 1
+    return counts
+
+def count_cron_rows(rows):
+    """Per-status counts of cron_jobs rows, classified like cron_row_status"""
+    _, counts = cron_status_codes(
+        [row.get("enabled", True) for row in rows],
+        [row.get("last_status") for row in rows],
+        [datetime.fromisoformat(row["next_run_at"]).timestamp() * 1000 if row.get("next_run_at") else 0 for row in rows],
+    )
+    return counts
+
+def count_office_stats(agent_counts, cron_counts):
+    """Sidebar counters from per-status counts (OpenClaw data, or Supabase rows without the view)"""
+    return {
+        "total_agents": sum(agent_counts.values()),
+        "active_count": agent_counts.get("working", 0),
+        "idle_count": agent_counts.get("idle", 0),
+        "busy_count": agent_counts.get("failed", 0),
+        "total_crons": sum(cron_counts.values()),
+        "running_crons": cron_counts.get("running", 0),
+        "enabled_crons": sum(cron_counts.values()) - cron_counts.get("stopped", 0),
+        "pending_crons": cron_counts.get("pending", 0),
+        "failed_crons": cron_counts.get("failed", 0),
+    }
+
+@st.cache_resource
+def get_realtime_store():
+    """Store fed by the one realtime listener of this server process"""
+    store = RealtimeStore({"agent_status": AGENT_COLUMNS, "cron_jobs": CRON_COLUMNS}, ["activity_log"])
+    
+    def reload():
+        store.seed("agent_status", fetch_pages("agent_status", AGENT_COLUMNS))
+        store.seed("cron_jobs", fetch_pages("cron_jobs", CRON_COLUMNS))
+        store.seed("activity_log", query_recent_activity(limit=store.logs["activity_log"].maxlen))
+    
+    listener = RealtimeListener(
+        SUPABASE_REALTIME_URL or realtime_url(SUPABASE_URL, SUPABASE_KEY),
+        ["agent_status", "cron_jobs", "activity_log"],
+        api_key=SUPABASE_KEY, on_change=store.apply, on_connect=reload,
+    )
+    reload()
+    listener.start()
+    return store, listener
+
 def read_sessions_from_openclaw():
-    """Read sessions directly from OpenClaw filesystem"""
+    """Read sessions directly from OpenClaw filesystem (only the fields the cards use)"""
     sessions_file = OPENCLAW_SESSIONS_DIR / "sessions.json"
     if not sessions_file.exists():
         return {}
     try:
-        with open(sessions_file, 'r') as f:
-            return json.load(f)
+        # Streams the file; skillsSnapshot is skipped except for counting its skills
+        return read_session_index(sessions_file)
     except Exception as e:
         return {}
 
@@ -571,83 +815,32 @@ def read_cron_from_openclaw():
         return {"jobs": []}
 
 def process_openclaw_sessions(sessions_data):
-    """Process OpenClaw sessions into agent cards"""
+    """Process OpenClaw sessions into agent cards, plus per-status counts"""
     agents = []
-    current_time = datetime.now().timestamp() * 1000
+    records, counts = agent_batch(sessions_data)
     
-    for agent_id, session_info in sessions_data.items():
-        updated_at = session_info.get("updatedAt", 0)
-        time_diff = current_time - updated_at
-        
-        # Determine status
-        if time_diff < 5 * 60 * 1000:  # Active in last 5 min
-            status = "working"
-        elif time_diff < 30 * 60 * 1000:  # Active in last 30 min
-            status = "idle"
-        else:
-            status = "completed"
-        
-        # Get details
-        details = session_info.get("skillsSnapshot", {})
-        
+    for record in records:
         agents.append({
-            "name": agent_id.replace("agent:", "").title(),
-            "agent_id": agent_id,
-            "status": status,
-            "task": f"Session: {session_info.get('sessionId', 'N/A')[:8]}...",
-            "thinking_level": session_info.get("thinkingLevel", "normal"),
-            "last_update": datetime.fromtimestamp(updated_at / 1000).strftime("%H:%M:%S"),
-            "session_id": session_info.get("sessionId", ""),
-            "skills_count": len(details.get("skills", []))
+            "name": record.session_key.replace("agent:", "").title(),
+            "agent_id": record.session_key,
+            "status": record.status,
+            "task": f"Session: {(record.session_id or 'N/A')[:8]}...",
+            "thinking_level": record.thinking_level,
+            "last_update": datetime.fromtimestamp(record.updated_at_ms / 1000).strftime("%H:%M:%S"),
+            "session_id": record.session_id,
+            "skills_count": record.skills_count
         })
     
-    return agents
+    return agents, counts
 
 def process_openclaw_crons(cron_data):
-    """Process OpenClaw cron jobs"""
+    """Process OpenClaw cron jobs, plus per-status counts"""
     jobs = []
+    records, counts = cron_batch(cron_data)
     
-    for job in cron_data.get("jobs", []):
-        state = job.get("state", {})
-        schedule = job.get("schedule", {})
-        
-        # Determine status
-        if not job.get("enabled", True):
-            status = "stopped"
-        elif state.get("lastStatus") == "ok":
-            next_run = state.get("nextRunAtMs", 0)
-            current_time = datetime.now().timestamp() * 1000
-            if next_run > current_time:
-                status = "pending"
-            else:
-                status = "running"
-        elif state.get("lastStatus") == "error":
-            status = "failed"
-        else:
-            status = "pending"
-        
-        # Format last run time
-        last_run = state.get("lastRunAtMs")
-        last_run_str = "Never"
-        if last_run:
-            last_run_dt = datetime.fromtimestamp(last_run / 1000)
-            if last_run_dt.date() == datetime.now().date():
-                last_run_str = last_run_dt.strftime("%H:%M")
-            else:
-                last_run_str = last_run_dt.strftime("%m-%d %H:%M")
-        
-        # Format next run time
-        next_run = state.get("nextRunAtMs")
-        next_run_str = "Not scheduled"
-        if next_run:
-            next_run_dt = datetime.fromtimestamp(next_run / 1000)
-            if next_run_dt.date() == datetime.now().date():
-                next_run_str = next_run_dt.strftime("%H:%M")
-            else:
-                next_run_str = next_run_dt.strftime("%m-%d %H:%M")
-        
+    for record in records:
         # Format duration
-        duration_ms = state.get("lastDurationMs", 0)
+        duration_ms = record.last_duration_ms
         if duration_ms < 1000:
             duration_str = f"{duration_ms}ms"
         elif duration_ms < 60000:
@@ -656,42 +849,380 @@ def process_openclaw_crons(cron_data):
             duration_str = f"{duration_ms/60000:.1f}m"
         
         jobs.append({
-            "name": job.get("name", "Unnamed Job"),
-            "job_id": job.get("id", ""),
-            "status": status,
-            "schedule": schedule.get("expr", "N/A"),
-            "timezone": schedule.get("tz", "UTC"),
-            "last_run": last_run_str,
-            "next_run": next_run_str,
-            "last_status": state.get("lastStatus", "never"),
+            "name": record.name or "Unnamed Job",
+            "job_id": record.job_id,
+            "status": record.status,
+            "schedule": record.schedule_expr or "N/A",
+            "timezone": record.timezone or "UTC",
+            "last_run": format_time(record.last_run_ms) if record.last_run_ms else "Never",
+            "next_run": format_time(record.next_run_ms) if record.next_run_ms else "Not scheduled",
+            "last_status": record.last_status or "never",
             "last_duration": duration_str,
-            "next_run_raw": state.get("nextRunAtMs", 0),
-            "enabled": job.get("enabled", True),
-            "delivery": job.get("delivery", {}),
-            "session_target": job.get("sessionTarget", ""),
-            "payload_message": job.get("payload", {}).get("message", "")[:100] if job.get("payload", {}).get("message") else ""
+            "last_duration_ms": record.last_duration_ms,
+            "model": record.model,
+            "next_run_raw": record.next_run_ms,
+            "last_run_raw": record.last_run_ms,
+            "enabled": record.enabled,
+            "session_target": record.session_target,
+            "payload_message": record.payload_message[:100]
         })
     
-    return jobs
+    return jobs, counts
+
+# ======== OpenClaw File Cache ========
+@st.cache_resource
+def get_file_cache():
+    """One cache of processed OpenClaw files per server process"""
+    return FileCache()
+
+def next_midnight():
+    """Day-relative labels ("HH:MM" vs "MM-DD HH:MM") change at midnight"""
+    tomorrow = datetime.now().date() + timedelta(days=1)
+    return datetime.combine(tomorrow, datetime.min.time()).timestamp()
+
+def sessions_valid_until(sessions_data):
+    """When the next agent crosses the 5 / 30 minute working -> idle -> completed line"""
+    now = time.time()
+    boundaries = [next_midnight()]
+    for session_info in sessions_data.values():
+        updated_at = session_info.get("updatedAt") or 0
+        boundaries.extend(t for t in ((updated_at + WORKING_WINDOW_MS) / 1000, (updated_at + IDLE_WINDOW_MS) / 1000) if t > now)
+    return min(boundaries)
+
+def crons_valid_until(cron_data):
+    """When the next pending job's nextRunAtMs passes (it then shows as running)"""
+    now = time.time()
+    boundaries = [next_midnight()]
+    for job in cron_data.get("jobs", []):
+        next_run = ((job.get("state") or {}).get("nextRunAtMs") or 0) / 1000
+        if next_run > now:
+            boundaries.append(next_run)
+    return min(boundaries)
+
+def load_openclaw_agents():
+    """(agent cards, status counts) from sessions.json, re-parsed only when the file changes"""
+    def load():
+        sessions = read_sessions_from_openclaw()
+        return process_openclaw_sessions(sessions), sessions_valid_until(sessions)
+    return get_file_cache().get(OPENCLAW_SESSIONS_DIR / "sessions.json", load)
+
+def load_openclaw_crons():
+    """(cron cards, status counts) from jobs.json, re-parsed only when the file changes"""
+    def load():
+        crons = read_cron_from_openclaw()
+        return process_openclaw_crons(crons), crons_valid_until(crons)
+    return get_file_cache().get(OPENCLAW_CRON_DIR / "jobs.json", load)
 
 # ======== Main Data Loading ========
-# Try Supabase first, fall back to OpenClaw filesystem
-agents_data = []
-cron_data_list = []
+def load_dashboard_data(realtime_store=None):
+    """Agents, crons and sidebar counters: Supabase (or its realtime store) first, OpenClaw filesystem as fallback"""
+    agents_data = []
+    cron_data_list = []
+    
+    if realtime_store:
+        agents_data = realtime_store.snapshot("agent_status")
+        cron_data_list = realtime_store.snapshot("cron_jobs")
+    elif supabase:
+        agents_data = fetch_agent_status_from_supabase() or []
+        cron_data_list = fetch_cron_jobs_from_supabase() or []
+    agents_from_supabase = bool(agents_data)
+    crons_from_supabase = bool(cron_data_list)
+    
+    # If no Supabase data, read from OpenClaw directly
+    agent_counts, cron_counts = {}, {}
+    if not agents_data:
+        agents_data, agent_counts = load_openclaw_agents()
+    
+    if not cron_data_list:
+        cron_data_list, cron_counts = load_openclaw_crons()
+    
+    # Counted server-side for whatever came from Supabase, during classification for OpenClaw fallback data.
+    # Without the dashboard_counters view (schema not re-applied, or the query failed) count the fetched rows.
+    counters = fetch_dashboard_counters_from_supabase() if agents_from_supabase or crons_from_supabase else None
+    if not counters:
+        if agents_from_supabase:
+            agent_counts = count_agent_rows(agents_data)
+        if crons_from_supabase:
+            cron_counts = count_cron_rows(cron_data_list)
+    stats = count_office_stats(agent_counts, cron_counts)
+    if counters and agents_from_supabase:
+        stats.update({k: counters[k] for k in AGENT_COUNTERS})
+    if counters and crons_from_supabase:
+        stats.update({k: counters[k] for k in CRON_COUNTERS})
+    
+    return {
+        "agents": agents_data,
+        "crons": cron_data_list,
+        "stats": stats,
+        "sources": {
+            "agents": "supabase" if agents_from_supabase else "openclaw",
+            "crons": "supabase" if crons_from_supabase else "openclaw",
+        },
+    }
+
+@st.cache_resource
+def get_snapshot_store():
+    """One refresher per server process; N viewers cost one fetch per interval, not N"""
+    realtime_store = realtime_listener = None
+    if supabase and REALTIME:
+        try:
+            realtime_store, realtime_listener = get_realtime_store()
+        except Exception as e:
+            print(f"⚠️  Realtime unavailable, polling instead: {e}")
+    
+    if realtime_store:
+        # Rebuild as soon as a change is pushed, and at least every SNAPSHOT_REFRESH_SECONDS
+        seen = {"version": None, "at": 0.0}
+        def build():
+            if realtime_store.version == seen["version"] and time.monotonic() - seen["at"] < SNAPSHOT_REFRESH_SECONDS:
+                return None
+            seen["version"], seen["at"] = realtime_store.version, time.monotonic()
+            return load_dashboard_data(realtime_store)
+        store = SnapshotStore(build, REALTIME_CHECK_SECONDS)
+    else:
+        store = SnapshotStore(load_dashboard_data, SNAPSHOT_REFRESH_SECONDS)
+    store.start()
+    return store, realtime_listener
+
 use_supabase = supabase is not None
+snapshot_store, realtime_listener = get_snapshot_store()
+
+# ======== Panels ========
+# Each panel re-reads the shared snapshot on its own tick (st.fragment), so
+# auto-refresh reruns only these; the CSS and page layout are sent once.
+MAX_AGENT_CARDS = 24
+
+def cron_row_status(job):
+    """Display status for a cron row; Supabase rows carry none, so derive it like dashboard_counters"""
+    if job.get("status"):
+        return job["status"]
+    next_run = job.get("next_run_at")
+    next_run_ms = datetime.fromisoformat(next_run).timestamp() * 1000 if next_run else 0
+    return classify_cron(job.get("enabled", True), job.get("last_status"), next_run_ms)
+
+@st.cache_data(max_entries=4)
+def agent_card_html(version, _agents):
+    """(agent_name, card markup) per snapshot version; unchanged data reuses it (and keeps its emoji)"""
+    order = {"working": 0, "idle": 1, "failed": 2, "completed": 3}
+    cards = []
+    for agent in sorted(_agents, key=lambda a: order.get(a.get("status"), 4))[:MAX_AGENT_CARDS]:
+        status = agent.get("status", "idle")
+        status_class = get_status_class(status) or "idle"
+        name = agent.get("name") or agent.get("agent_name", "")
+        task = agent.get("task") or agent.get("task_name") or ""
+        last_update = agent.get("last_update") or format_time(agent.get("updated_at"))
+        cards.append((agent.get("agent_name"), f"""
+        <div class="employee-card {status_class}">
+            <div class="worker-emoji {get_work_animation(status)}">{get_worker_emoji(status)}</div>
+            <div><b>{html.escape(name[:30])}</b></div>
+            <div class="status-badge status-{status_class}">{get_status_emoji(status)} {html.escape(status.title())}</div>
+            <div class="task-bubble">{html.escape(task[:60])}</div>
+            <div class="cron-details">🕐 {html.escape(last_update)}</div>
+        </div>
+        """))
+    return cards
+
+def render_agent_desks():
+    snapshot = snapshot_store.current()
+    st.markdown("## 👥 Office Floor")
+    if not snapshot.agents:
+        st.info("😴 Nobody at their desk right now")
+        return
+    
+    cards = agent_card_html(snapshot.version, snapshot.agents)
+    columns = st.columns(3)
+    for i, (agent_name, card) in enumerate(cards):
+        column = columns[i % 3]
+        column.markdown(card, unsafe_allow_html=True)
+        # The details JSONB isn't in the list query; fetch one agent's when asked for
+        if snapshot.sources.get("agents") == "supabase" and column.toggle("🔎 Details", key=f"details-{i}-{agent_name}"):
+            details = (fetch_agent_details_from_supabase(agent_name) or {}).get("details")
+            column.json(details or {})
+    if len(snapshot.agents) > len(cards):
+        st.caption(f"…and {len(snapshot.agents) - len(cards)} more agents")
+
+def render_cron_board():
+    snapshot = snapshot_store.current()
+    st.markdown("## ⚙️ Cron Board")
+    if not snapshot.crons:
+        st.info("📅 No cron jobs scheduled")
+        return
+    
+    for i, job in enumerate(snapshot.crons):
+        status = cron_row_status(job)
+        schedule = job.get("schedule") or job.get("schedule_expr") or "N/A"
+        last_run = job.get("last_run") or format_time(job.get("last_run_at"))
+        next_run = job.get("next_run") or format_time(job.get("next_run_at"))
+        st.markdown(f"""
+        <div class="cron-card {html.escape(status)}">
+            <div>
+                <span class="status-dot {html.escape(status)}"></span><b>{html.escape(job.get("name") or "Unnamed Job")}</b>
+                <div class="cron-details"><span class="cron-schedule">{html.escape(schedule)}</span> · last {html.escape(last_run)} · next {html.escape(next_run)}</div>
+            </div>
+            <div>{get_status_emoji(status)}</div>
+        </div>
+        """, unsafe_allow_html=True)
+        
+        # Payload text is only fetched for Supabase rows when asked for; the
+        # index keeps keys unique when job_id is missing or repeated
+        if st.toggle("📜 Payload", key=f"payload-{i}-{job.get('job_id')}"):
+            payload = job.get("payload_message")
+            if payload is None and snapshot.sources.get("crons") == "supabase":
+                payload = (fetch_cron_job_details_from_supabase(job.get("job_id")) or {}).get("payload_message")
+            st.caption(payload or "(no payload)")
 
-if use_supabase:
-    agents_data = fetch_agent_status_from_supabase() or []
-    cron_data_list = fetch_cron_jobs_from_supabase() or []
+TIMELINE_HOURS = 24
+MAX_TIMELINE_DOTS = 96  # per job; an every-minute job would otherwise draw 1440
 
-# If no Supabase data, read from OpenClaw directly
-if not agents_data:
-    sessions = read_sessions_from_openclaw()
-    agents_data = process_openclaw_sessions(sessions)
+def thin_evenly(items, limit):
+    """At most `limit` items spread evenly over the list, first and last kept"""
+    if len(items) <= limit:
+        return items
+    if limit < 2:
+        return items[:limit]
+    step = (len(items) - 1) / (limit - 1)
+    return [items[round(i * step)] for i in range(limit)]
 
-if not cron_data_list:
-    crons = read_cron_from_openclaw()
-    cron_data_list = process_openclaw_crons(crons)
+def to_epoch_ms(value):
+    """Epoch ms from epoch ms (OpenClaw rows) or an ISO string (Supabase rows)"""
+    if not value:
+        return 0
+    return value if isinstance(value, (int, float)) else datetime.fromisoformat(value).timestamp() * 1000
+
+@st.cache_data(max_entries=4)
+def cron_timeline(version, minute, _crons):
+    """
+    (name, fire offsets as % of the window, drift seconds) per enabled job
+    with a usable expression, for the TIMELINE_HOURS from `minute` (epoch
+    minutes); recomputed once per minute or snapshot version
+    """
+    start = datetime.fromtimestamp(minute * 60, timezone.utc)
+    end = start + timedelta(hours=TIMELINE_HOURS)
+    window = (end - start).total_seconds()
+    rows = []
+    for job in _crons:
+        if not job.get("enabled", True):
+            continue
+        expr = job.get("schedule_expr") or job.get("schedule") or ""
+        tz = job.get("timezone")
+        try:
+            fires = list(takewhile(lambda t: t < end, fire_times(expr, tz, start)))
+        except ValueError:
+            continue  # not a cron expression (e.g. "N/A")
+        drift = schedule_drift_seconds(
+            expr, tz,
+            to_epoch_ms(job.get("next_run_raw") or job.get("next_run_at")),
+            to_epoch_ms(job.get("last_run_raw") or job.get("last_run_at")),
+        )
+        # Thinned across the whole window, so frequent jobs still span all of it
+        offsets = [(fire - start).total_seconds() / window * 100 for fire in thin_evenly(fires, MAX_TIMELINE_DOTS)]
+        rows.append((job.get("name") or "Unnamed Job", offsets, drift))
+    return rows
+
+def render_cron_timeline():
+    snapshot = snapshot_store.current()
+    minute = int(time.time() // 60)
+    st.markdown(f"## 🗓️ Next {TIMELINE_HOURS}h")
+    rows = cron_timeline(snapshot.version, minute, snapshot.crons)
+    if not rows:
+        st.info("📅 Nothing scheduled in the next day")
+        return
+    
+    lines = []
+    for name, offsets, drift in rows:
+        dots = "".join(f'<span class="timeline-dot" style="left: {offset:.2f}%;"></span>' for offset in offsets)
+        late = ""
+        if drift is not None and abs(drift) > DRIFT_TOLERANCE_SECONDS:
+            late = f'<span class="timeline-drift" title="recorded next run vs schedule">⏰ {drift / 60:+.0f}m</span>'
+        lines.append(f'<div class="timeline-row"><div class="timeline-label">{html.escape(name)}</div>'
+                     f'<div class="timeline-track">{dots}</div>{late}</div>')
+    st.markdown("".join(lines), unsafe_allow_html=True)
+    
+    start = datetime.fromtimestamp(minute * 60)
+    st.caption(f"{start:%H:%M} → {start + timedelta(hours=TIMELINE_HOURS):%m-%d %H:%M} · "
+               f"⏰ marks jobs whose recorded next run is off their schedule")
+
+FORECAST_DAYS = 7
+
+def forecast_jobs(crons):
+    """Cron rows of either source in the shape forecast_load reads"""
+    return [
+        {
+            "name": job.get("name"),
+            "schedule_expr": job.get("schedule_expr") or job.get("schedule"),
+            "timezone": job.get("timezone"),
+            "last_duration_ms": job.get("last_duration_ms"),
+            "model": job.get("model"),
+            "enabled": job.get("enabled", True),
+        }
+        for job in crons
+    ]
+
+@st.cache_data(max_entries=4)
+def cron_load_forecast(version, day, _crons):
+    """
+    Hourly peak concurrency for FORECAST_DAYS from local midnight of `day`,
+    plus the busiest start minutes and per-model peaks
+    """
+    start = datetime.combine(day, datetime.min.time())
+    forecast = forecast_load(forecast_jobs(_crons), int(start.timestamp() // 60), FORECAST_DAYS * 24 * 60)
+    return {
+        "start": start,
+        "heatmap": forecast.heatmap().tolist(),
+        "peak": forecast.peak,
+        "collisions": forecast.collisions(top=3),
+        "model_peaks": {model: int(load.max()) for model, load in forecast.by_model.items()},
+    }
+
+def render_load_heatmap():
+    snapshot = snapshot_store.current()
+    st.markdown("## 🔥 Cron Load Forecast")
+    forecast = cron_load_forecast(snapshot.version, datetime.now().date(), snapshot.crons)
+    if not forecast["peak"]:
+        st.info("😌 No scheduled runs to forecast")
+        return
+    
+    peak = forecast["peak"]
+    header = "".join(f"<th>{hour:02d}</th>" for hour in range(24))
+    rows = []
+    for i, row in enumerate(forecast["heatmap"]):
+        label = (forecast["start"] + timedelta(days=i)).strftime("%a %m-%d")
+        cells = "".join(
+            f'<td style="background: rgba(255,107,157,{0.08 + 0.92 * load / peak:.2f});" title="{load} concurrent">{load or ""}</td>'
+            for load in row
+        )
+        rows.append(f"<tr><th>{label}</th>{cells}</tr>")
+    st.markdown(f'<table class="load-heatmap"><tr><th></th>{header}</tr>{"".join(rows)}</table>', unsafe_allow_html=True)
+    st.caption("Peak concurrent runs per hour, from each job's schedule and last duration · "
+               + " · ".join(f"{model} peak {count}" for model, count in forecast["model_peaks"].items()))
+    
+    for minute, names in forecast["collisions"]:
+        when = datetime.fromtimestamp(minute * 60).strftime("%a %H:%M")
+        shown = ", ".join(names[:5]) + (f" +{len(names) - 5}" if len(names) > 5 else "")
+        st.markdown(f"💥 **{when}** · {len(names)} jobs start together: {shown}")
+
+def render_office_stats():
+    snapshot = snapshot_store.current()
+    stats = snapshot.stats
+    st.caption(f"🗂️ Snapshot v{snapshot.version} · {datetime.fromtimestamp(snapshot.built_at).strftime('%H:%M:%S')}")
+    
+    st.markdown("### 📊 Office Stats")
+    
+    col1, col2 = st.columns(2)
+    col1.metric("🟢 Working", stats["active_count"])
+    col2.metric("🟡 Idle", stats["idle_count"])
+    st.metric("🔴 Issues", stats["busy_count"])
+    
+    st.markdown("---")
+    
+    # Cron stats
+    st.markdown("### ⚙️ Cron Jobs")
+    st.metric("⚡ Active", stats["running_crons"], f"/ {stats['enabled_crons']} enabled")
+    
+    if stats["failed_crons"] > 0:
+        st.warning(f"❌ {stats['failed_crons']} failed jobs")
+    if stats["pending_crons"] > 0:
+        st.info(f"⏳ {stats['pending_crons']} pending")
 
 # ======== Sidebar ========
 with st.sidebar:
@@ -702,43 +1233,29 @@ with st.sidebar:
     """, unsafe_allow_html=True)
     
     # Connection status
-    if use_supabase:
+    if realtime_listener and realtime_listener.connected:
+        st.markdown('<div class="live-indicator"><span class="live-dot"></span> Live via Supabase Realtime</div>', unsafe_allow_html=True)
+    elif realtime_listener:
+        st.warning("⚡ Realtime reconnecting...")
+    elif use_supabase:
         st.markdown('<div class="live-indicator"><span class="live-dot"></span> Connected to Supabase</div>', unsafe_allow_html=True)
     else:
         st.warning("⚠️ Demo Mode - No Supabase")
         st.caption("Set SUPABASE_URL and SUPABASE_KEY env vars")
     
-    st.markdown("### 📊 Office Stats")
-    
-    active_count = sum(1 for a in agents_data if a.get("status", a.get("status", "")) in ["working", "active"])
-    idle_count = sum(1 for a in agents_data if a.get("status", a.get("status", "")) == "idle")
-    busy_count = sum(1 for a in agents_data if a.get("status", a.get("status", "")) in ["failed", "busy"])
-    
-    col1, col2 = st.columns(2)
-    col1.metric("🟢 Working", active_count)
-    col2.metric("🟡 Idle", idle_count)
-    st.metric("🔴 Issues", busy_count)
-    
-    st.markdown("---")
-    
-    # Cron stats
-    running_crons = sum(1 for c in cron_data_list if c.get("status") == "running")
-    enabled_crons = sum(1 for c in cron_data_list if c.get("enabled", True))
-    st.markdown("### ⚙️ Cron Jobs")
-    st.metric("⚡ Active", running_crons, f"/ {enabled_crons} enabled")
-    
-    pending_crons = sum(1 for c in cron_data_list if c.get("status") == "pending")
-    failed_crons = sum(1 for c in cron_data_list if c.get("status") == "failed")
-    if failed_crons > 0:
-        st.warning(f"❌ {failed_crons} failed jobs")
-    if pending_crons > 0:
-        st.info(f"⏳ {pending_crons} pending")
+    stats_container = st.container()
     
     st.markdown("---")
     
     # Auto-refresh toggle
     st.session_state.auto_refresh = st.toggle("🔄 Auto Refresh", value=True)
     refresh_rate = st.slider("⏱️ Refresh Rate (sec)", 1, 30, 5)
+    run_every = refresh_rate if st.session_state.auto_refresh else None
+    if st.button("🔃 Refresh Now"):
+        snapshot_store.request_refresh(timeout=MANUAL_REFRESH_WAIT_SECONDS)
+    
+    with stats_container:
+        st.fragment(run_every=run_every)(render_office_stats)()
     
     st.markdown("---")
     
@@ -752,3 +1269,15 @@ with st.sidebar:
     
     if st.button("📝 Generate Report"):
         st.toast("📊 Report generation started! 📈")
+
+# ======== Main Page ========
+st.markdown("<h1>🍃 Anime Office Command Center 🌸</h1>", unsafe_allow_html=True)
+
+desk_col, cron_col = st.columns([2, 1])
+with desk_col:
+    st.fragment(run_every=run_every)(render_agent_desks)()
+with cron_col:
+    st.fragment(run_every=run_every)(render_cron_board)()
+
+st.fragment(run_every=run_every)(render_cron_timeline)()
+st.fragment(run_every=run_every)(render_load_heatmap)()
@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""
+🍃 Session Ingest Benchmark
+Builds a synthetic sessions directory and times read_sessions_data()
+from 1 worker up to N
+
+Usage: python bench_session_ingest.py [--files 10000] [--max-workers N] [--executor process|thread]
+"""
+
+import argparse
+import json
+import os
+import random
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+from session_reader import read_sessions_data
+
+def build_sessions_dir(root, files, lines_per_file):
+    """Write `files` transcripts with a few JSON lines each"""
+    now = datetime.now(timezone.utc)
+    for i in range(files):
+        with open(root / f"session-{i:06d}.jsonl", 'w') as f:
+            for line in range(lines_per_file):
+                ts = now - timedelta(seconds=random.randint(0, 7200))
+                f.write(json.dumps({
+                    "type": "message",
+                    "timestamp": ts.isoformat().replace("+00:00", "Z"),
+                    "content": f"step {line} " + "lorem ipsum " * random.randint(5, 40),
+                }) + "\n")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--files", type=int, default=10000)
+    parser.add_argument("--lines", type=int, default=20, help="JSON lines per transcript")
+    parser.add_argument("--max-workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--executor", choices=["process", "thread"], default="process")
+    parser.add_argument("--repeat", type=int, default=3, help="best-of runs per worker count")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        print(f"📁 Building {args.files} session files in {root}...")
+        build_sessions_dir(root, args.files, args.lines)
+
+        worker_counts = sorted({1, *[2 ** i for i in range(1, 8) if 2 ** i < args.max_workers], args.max_workers})
+        baseline = None
+        print(f"\n{'workers':>8} {'best (s)':>10} {'files/s':>10} {'speedup':>8}")
+        for workers in worker_counts:
+            best = float("inf")
+            for _ in range(args.repeat):
+                started = time.perf_counter()
+                sessions = read_sessions_data(root, workers=workers, executor=args.executor)
+                best = min(best, time.perf_counter() - started)
+            assert len(sessions) == args.files
+            baseline = baseline or best
+            print(f"{workers:>8} {best:>10.3f} {args.files / best:>10.0f} {baseline / best:>7.2f}x")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+"""
+🍃 Row Change Cache
+Content hashes of the rows last written to Supabase, so the sync daemon only
+sends rows whose meaningful fields changed (plus an optional heartbeat)
+"""
+
+import hashlib
+import json
+import os
+import time
+from pathlib import Path
+
+STATE_VERSION = 1
+
+# Fields that change every cycle without the row meaning anything new
+VOLATILE_FIELDS = frozenset({"updated_at", "started_at"})
+
+def row_hash(row, volatile_fields=VOLATILE_FIELDS):
+    """Stable hash of a row's non-volatile content"""
+    content = {k: v for k, v in row.items() if k not in volatile_fields}
+    encoded = json.dumps(content, sort_keys=True, default=str).encode('utf-8')
+    return hashlib.blake2b(encoded, digest_size=16).hexdigest()
+
+class ChangeCache:
+    """Per-key content hashes persisted across daemon restarts"""
+
+    def __init__(self, state_file, key_field, heartbeat_seconds=0, volatile_fields=VOLATILE_FIELDS):
+        self.state_file = Path(state_file)
+        self.key_field = key_field
+        self.heartbeat_seconds = heartbeat_seconds
+        self.volatile_fields = volatile_fields
+        self.entries = {}  # key -> [hash, last_written_epoch]
+        self.dirty = False
+        self.load()
+
+    # ======== State Persistence ========
+    def load(self):
+        """Load saved hashes (a missing or corrupt file means everything is new)"""
+        try:
+            with open(self.state_file, 'r') as f:
+                state = json.load(f)
+            if state.get("version") == STATE_VERSION:
+                self.entries = state.get("entries", {})
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            print(f"⚠️  Ignoring change cache {self.state_file}: {e}")
+
+    def save(self):
+        """Atomically persist hashes if anything changed"""
+        if not self.dirty:
+            return
+        self.state_file.parent.mkdir(parents=True, exist_ok=True)
+        tmp_file = self.state_file.with_suffix(".tmp")
+        with open(tmp_file, 'w') as f:
+            json.dump({"version": STATE_VERSION, "entries": self.entries}, f)
+        os.replace(tmp_file, self.state_file)
+        self.dirty = False
+
+    # ======== Change Detection ========
+    def changed(self, rows):
+        """Rows whose content differs from the last write, or whose heartbeat is due"""
+        now = time.time()
+        changed = []
+        for row in rows:
+            entry = self.entries.get(row[self.key_field])
+            if entry is None or entry[0] != row_hash(row, self.volatile_fields):
+                changed.append(row)
+            elif self.heartbeat_seconds and now - entry[1] >= self.heartbeat_seconds:
+                changed.append(row)
+        return changed
+
+    def commit(self, rows):
+        """Record rows as successfully written"""
+        now = time.time()
+        for row in rows:
+            self.entries[row[self.key_field]] = [row_hash(row, self.volatile_fields), now]
+            self.dirty = True
+
+    def forget(self, keys):
+        """Treat keys as never written, so their rows are sent again"""
+        for key in keys:
+            if self.entries.pop(key, None) is not None:
+                self.dirty = True
+
+    def prune(self, keys):
+        """Forget keys that no longer exist (call after a full scan)"""
+        keys = set(keys)
+        for key in list(self.entries):
+            if key not in keys:
+                del self.entries[key]
+                self.dirty = True
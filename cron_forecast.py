@@ -0,0 +1,178 @@
+"""
+🍃 Cron Forecast
+Expands every enabled job's schedule over a window at minute resolution and
+stacks each run's last known duration into concurrent load per minute. Run
+intervals are overlapped with a start/end difference array and a cumsum,
+so the cost is per fire time, not per fire time x minute.
+"""
+
+import math
+from dataclasses import dataclass, field, replace
+from datetime import datetime, timedelta, timezone
+
+import numpy as np
+
+from cron_schedule import parse_cron, schedule_zone
+
+# ======== Configuration ========
+DEFAULT_WINDOW_MINUTES = 7 * 24 * 60
+MAX_RUN_MINUTES = 24 * 60  # longer runs are capped (and runs started this far back still count)
+DEFAULT_MODEL = "default"
+
+# ======== Calendar ========
+def _utc_offsets(zone, start_minute, minutes):
+    """UTC offset in minutes for each epoch minute: looked up per hour, per minute only across a change"""
+    def offset(minute):
+        return datetime.fromtimestamp(minute * 60, timezone.utc).astimezone(zone).utcoffset() // timedelta(minutes=1)
+
+    hours = math.ceil(minutes / 60)
+    per_hour = [offset(start_minute + h * 60) for h in range(hours + 1)]
+    offsets = np.repeat(np.array(per_hour[:-1], dtype=np.int64), 60)[:minutes]
+    for h in range(hours):
+        if per_hour[h] != per_hour[h + 1]:
+            first = h * 60
+            for m in range(first, min(first + 60, minutes)):
+                offsets[m] = offset(start_minute + m)
+    return offsets
+
+@dataclass(frozen=True)
+class _Calendar:
+    """Wall-clock fields of each minute of a window in one zone"""
+    minute: np.ndarray
+    hour: np.ndarray
+    day: np.ndarray
+    month: np.ndarray
+    weekday: np.ndarray   # 0 = Sunday
+    repeated: np.ndarray  # second pass through a wall-clock time (DST fall-back)
+    gaps: tuple = ()      # (index, _Calendar of the wall minutes a DST jump skipped just before it)
+
+def _wall_calendar(local, repeated):
+    """_Calendar for local wall-clock epoch minutes"""
+    days = local // 1440
+    month_index = days.astype("datetime64[D]").astype("datetime64[M]").astype(np.int64)
+    return _Calendar(
+        minute=local % 60,
+        hour=local // 60 % 24,
+        day=(days - month_index.astype("datetime64[M]").astype("datetime64[D]").astype(np.int64)) + 1,
+        month=month_index % 12 + 1,
+        weekday=(days + 4) % 7,  # 1970-01-01 was a Thursday
+        repeated=repeated,
+    )
+
+def _calendar(tz, start_minute, minutes):
+    # One minute of lead so a jump right at the window start is seen too
+    utc = np.arange(start_minute - 1, start_minute + minutes, dtype=np.int64)
+    local = utc + _utc_offsets(schedule_zone(tz), start_minute - 1, minutes + 1)
+    seen = np.maximum.accumulate(np.concatenate(([np.iinfo(np.int64).min], local[:-1])))
+    gaps = []
+    for i in np.flatnonzero(np.diff(local) > 1):
+        skipped = np.arange(local[i] + 1, local[i + 1], dtype=np.int64)
+        gaps.append((int(i), _wall_calendar(skipped, np.zeros(skipped.size, dtype=bool))))
+    return replace(_wall_calendar(local[1:], (local <= seen)[1:]), gaps=tuple(gaps))
+
+def _bit_table(bits, size):
+    return np.array([(bits >> i) & 1 for i in range(size)], dtype=bool)
+
+def _fire_mask(expr, calendar):
+    """
+    True at each minute the expression fires, matching cron_schedule.fire_times:
+    a match in a DST gap fires at the first minute after the jump
+    """
+    schedule = parse_cron(expr)
+    dom = _bit_table(schedule.days, 32)[calendar.day]
+    dow = _bit_table(schedule.weekdays, 7)[calendar.weekday]
+    day = dom & dow if schedule.any_day or schedule.any_weekday else dom | dow
+    mask = (
+        _bit_table(schedule.minutes, 60)[calendar.minute]
+        & _bit_table(schedule.hours, 24)[calendar.hour]
+        & _bit_table(schedule.months, 13)[calendar.month]
+        & day
+        & ~calendar.repeated
+    )
+    for index, skipped in calendar.gaps:
+        if _fire_mask(expr, skipped).any():
+            mask[index] = True
+    return mask
+
+# ======== Forecast ========
+@dataclass(frozen=True)
+class LoadForecast:
+    """Per-minute forecast for the window starting at `start_minute` (epoch minutes)"""
+    start_minute: int
+    load: np.ndarray    # runs in progress each minute
+    starts: np.ndarray  # runs starting each minute
+    by_model: dict = field(default_factory=dict)  # model -> its share of load
+    fired: tuple = ()    # (job name, fire mask over the window) per job
+    skipped: tuple = ()  # jobs whose schedule isn't a cron expression
+
+    @property
+    def peak(self):
+        return int(self.load.max()) if self.load.size else 0
+
+    def heatmap(self, bin_minutes=60, bins_per_row=24):
+        """Peak load per bin, one row per `bins_per_row` bins (days of hours by default)"""
+        bins = math.ceil(self.load.size / bin_minutes)
+        rows = math.ceil(bins / bins_per_row)
+        padded = np.zeros(rows * bins_per_row * bin_minutes, dtype=self.load.dtype)
+        padded[:self.load.size] = self.load
+        return padded.reshape(rows, bins_per_row, bin_minutes).max(axis=2)
+
+    def collisions(self, top=5):
+        """[(epoch minute, [job names])] for the minutes where the most runs start together"""
+        crowded = np.flatnonzero(self.starts >= 2)
+        ranked = crowded[np.lexsort((crowded, -self.starts[crowded]))][:top]
+        return [
+            (self.start_minute + int(m), [name for name, mask in self.fired if mask[m]])
+            for m in ranked
+        ]
+
+def forecast_load(jobs, start_minute, minutes=DEFAULT_WINDOW_MINUTES):
+    """
+    LoadForecast for `jobs`: dicts with name, schedule_expr, timezone,
+    last_duration_ms, model and enabled (Supabase cron_jobs column names).
+    Each run is assumed to take the job's last duration, at least a minute.
+    """
+    jobs = [job for job in jobs if job.get("enabled", True)]
+    durations = [
+        min(max(math.ceil((job.get("last_duration_ms") or 0) / 60000), 1), MAX_RUN_MINUTES)
+        for job in jobs
+    ]
+    # Expand from early enough that runs started before the window are still counted
+    lead = max(durations, default=1) - 1
+    first, total = start_minute - lead, minutes + lead
+
+    calendars, masks = {}, {}
+    run_starts, run_ends, run_models = [], [], []
+    fired = []
+    skipped = []
+    for job, duration in zip(jobs, durations):
+        expr, tz = (job.get("schedule_expr") or "").strip(), job.get("timezone") or ""
+        key = (expr, tz)
+        if key not in masks:
+            if tz not in calendars:
+                calendars[tz] = _calendar(tz, first, total)
+            try:
+                mask = _fire_mask(expr, calendars[tz])
+            except ValueError:
+                mask = None
+            masks[key] = (mask, np.flatnonzero(mask) if mask is not None else None)
+        mask, fires = masks[key]
+        if mask is None:
+            skipped.append(job.get("name") or expr)
+            continue
+        run_starts.append(fires)
+        run_ends.append(np.minimum(fires + duration, total))
+        run_models.append(job.get("model") or DEFAULT_MODEL)
+        fired.append((job.get("name") or "Unnamed Job", mask[lead:]))
+
+    by_model = {}
+    starts = np.zeros(total, dtype=np.int64)
+    for model in sorted(set(run_models)):
+        picked = [i for i, m in enumerate(run_models) if m == model]
+        begin = np.concatenate([run_starts[i] for i in picked])
+        end = np.concatenate([run_ends[i] for i in picked])
+        delta = np.bincount(begin, minlength=total + 1) - np.bincount(end, minlength=total + 1)
+        by_model[model] = np.cumsum(delta)[lead:total]
+        starts += np.bincount(begin, minlength=total)[:total]
+    load = sum(by_model.values()) if by_model else np.zeros(minutes, dtype=np.int64)
+    return LoadForecast(start_minute, load, starts[lead:], by_model, tuple(fired), tuple(skipped))
@@ -0,0 +1,197 @@
+"""
+🍃 Cron Schedule
+Parses each distinct schedule.expr once into per-field bitsets and walks
+them to the next fire times in the job's schedule.tz, so the dashboard can
+look past the single nextRunAtMs OpenClaw records.
+"""
+
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache
+from itertools import islice
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
+# ======== Configuration ========
+DRIFT_TOLERANCE_SECONDS = 60  # recorded vs expected next run; beyond this it's drift
+MAX_SEARCH_YEARS = 30         # "0 0 29 2 1" can take decades; anything later never fires
+
+MACROS = {
+    "@yearly": "0 0 1 1 *",
+    "@annually": "0 0 1 1 *",
+    "@monthly": "0 0 1 * *",
+    "@weekly": "0 0 * * 0",
+    "@daily": "0 0 * * *",
+    "@midnight": "0 0 * * *",
+    "@hourly": "0 * * * *",
+}
+MONTH_NAMES = {name: i for i, name in enumerate(
+    ["jan", "feb", "mar", "apr", "may", "jun", "jul", "aug", "sep", "oct", "nov", "dec"], start=1)}
+WEEKDAY_NAMES = {name: i for i, name in enumerate(["sun", "mon", "tue", "wed", "thu", "fri", "sat"])}
+
+# ======== Parsing ========
+def _value(text, names):
+    value = names.get(text.lower()) if names else None
+    return value if value is not None else int(text)
+
+def _field_bits(field, low, high, names=None):
+    """Bitset (bit n = value n) for one comma-separated cron field"""
+    bits = 0
+    for part in field.split(","):
+        spec, _, step = part.partition("/")
+        step = int(step) if step else 1
+        if spec in ("*", "?"):
+            start, end = low, high
+        elif "-" in spec:
+            start, end = (_value(v, names) for v in spec.split("-", 1))
+        else:
+            start = _value(spec, names)
+            end = high if step > 1 else start
+        if step < 1 or not low <= start <= end <= high:
+            raise ValueError(f"bad cron field {field!r}")
+        for value in range(start, end + 1, step):
+            bits |= 1 << value
+    return bits
+
+def _next_bit(bits, start):
+    """Lowest set bit at or above `start`, or None"""
+    rest = bits >> start
+    if not rest:
+        return None
+    return start + (rest & -rest).bit_length() - 1
+
+@dataclass(frozen=True, slots=True)
+class CronSchedule:
+    """One parsed expression; naive datetimes here are wall-clock time in the job's zone"""
+    minutes: int
+    hours: int
+    days: int
+    months: int
+    weekdays: int  # bit 0 = Sunday
+    # Day-of-month "*" means match on weekday alone (and vice versa); when
+    # both are restricted either one matching is enough, as in Vixie cron
+    any_day: bool
+    any_weekday: bool
+
+    def day_matches(self, when):
+        dom = bool(self.days >> when.day & 1)
+        dow = bool(self.weekdays >> (when.weekday() + 1) % 7 & 1)
+        if self.any_day or self.any_weekday:
+            return dom and dow
+        return dom or dow
+
+    def next_after(self, when):
+        """First matching wall-clock minute strictly after `when`, or None"""
+        t = when.replace(second=0, microsecond=0) + timedelta(minutes=1)
+        limit = t.year + MAX_SEARCH_YEARS
+        while t.year < limit:
+            month = _next_bit(self.months, t.month)
+            if month is None:
+                t = datetime(t.year + 1, 1, 1)
+            elif month != t.month:
+                t = datetime(t.year, month, 1)
+            elif not self.day_matches(t):
+                t = datetime(t.year, t.month, t.day) + timedelta(days=1)
+            else:
+                hour = _next_bit(self.hours, t.hour)
+                if hour is None:
+                    t = datetime(t.year, t.month, t.day) + timedelta(days=1)
+                elif hour != t.hour:
+                    t = t.replace(hour=hour, minute=0)
+                else:
+                    minute = _next_bit(self.minutes, t.minute)
+                    if minute is not None:
+                        return t.replace(minute=minute)
+                    t = t.replace(minute=0) + timedelta(hours=1)
+        return None
+
+@lru_cache(maxsize=1024)
+def parse_cron(expr):
+    """
+    CronSchedule for a 5-field expression (or a @macro). A leading seconds
+    field is accepted and ignored: everything here is minute resolution.
+    Raises ValueError for anything else.
+    """
+    expr = MACROS.get(expr.strip().lower(), expr)
+    fields = expr.split()
+    if len(fields) == 6:
+        fields = fields[1:]
+    if len(fields) != 5:
+        raise ValueError(f"expected 5 cron fields, got {expr!r}")
+    minute, hour, day, month, weekday = fields
+    weekdays = _field_bits(weekday, 0, 7, WEEKDAY_NAMES)
+    return CronSchedule(
+        minutes=_field_bits(minute, 0, 59),
+        hours=_field_bits(hour, 0, 23),
+        days=_field_bits(day, 1, 31),
+        months=_field_bits(month, 1, 12, MONTH_NAMES),
+        weekdays=(weekdays | weekdays >> 7) & 0x7F,  # 7 is Sunday too
+        any_day=day.startswith(("*", "?")),
+        any_weekday=weekday.startswith(("*", "?")),
+    )
+
+@lru_cache(maxsize=128)
+def schedule_zone(tz):
+    """tzinfo for schedule.tz; empty or unknown zones fall back to UTC"""
+    try:
+        return ZoneInfo(tz) if tz else timezone.utc
+    except (ZoneInfoNotFoundError, ValueError):
+        return timezone.utc
+
+# ======== Fire Times ========
+def _exists(local, zone):
+    """Whether naive wall time `local` happens in `zone` (False inside a DST gap)"""
+    return local.replace(tzinfo=zone).astimezone(timezone.utc).astimezone(zone).replace(tzinfo=None) == local
+
+def _after_gap(local, zone):
+    """First wall-clock minute after the DST gap `local` falls in"""
+    while not _exists(local, zone):
+        local += timedelta(minutes=1)
+    return local
+
+def fire_times(expr, tz=None, after=None):
+    """
+    Aware datetimes (in the job's zone) strictly after `after` (default now),
+    ascending. Wall-clock times skipped by a DST jump fire once at the first
+    instant after the jump, as in Vixie cron; repeated ones fire once.
+    """
+    schedule = parse_cron(expr)
+    zone = schedule_zone(tz)
+    after = after or datetime.now(timezone.utc)
+    local = after.astimezone(zone).replace(tzinfo=None)
+    last = None
+    while True:
+        local = schedule.next_after(local)
+        if local is None:
+            return
+        wall = local if _exists(local, zone) else _after_gap(local, zone)
+        fire = wall.replace(tzinfo=zone)
+        if fire > after and fire != last:  # a gap's fires and its end minute collapse to one
+            last = fire
+            yield fire
+
+def next_fire_times(expr, tz=None, after=None, count=1):
+    """The next `count` fire times (fewer if the schedule runs out)"""
+    return list(islice(fire_times(expr, tz, after), count))
+
+def next_fire_ms(expr, tz=None, after_ms=None):
+    """Next fire time as epoch ms, or None"""
+    after = datetime.fromtimestamp(after_ms / 1000, timezone.utc) if after_ms is not None else None
+    fires = next_fire_times(expr, tz, after)
+    return fires[0].timestamp() * 1000 if fires else None
+
+def schedule_drift_seconds(expr, tz, next_run_ms, last_run_ms=None, now_ms=None):
+    """
+    Recorded nextRunAtMs minus the fire time the expression gives after the
+    last run (or now, for jobs that never ran): positive when the job is
+    booked late, negative when early or overdue. None if either is unknown.
+    """
+    if not next_run_ms:
+        return None
+    now_ms = datetime.now(timezone.utc).timestamp() * 1000 if now_ms is None else now_ms
+    try:
+        expected = next_fire_ms(expr, tz, last_run_ms or now_ms)
+    except ValueError:
+        return None
+    if expected is None:
+        return None
+    return (next_run_ms - expected) / 1000
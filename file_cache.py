@@ -0,0 +1,41 @@
+"""
+🍃 File Cache
+Processed results of reading a file, keyed on (path, st_mtime_ns, st_size):
+a hit costs one stat() until the file changes or the result expires
+"""
+
+import os
+import threading
+import time
+
+class FileCache:
+    """path -> (stat key, value, valid_until); safe to share across sessions"""
+
+    def __init__(self):
+        self.entries = {}
+        self.lock = threading.Lock()
+
+    @staticmethod
+    def stat_key(path):
+        try:
+            st = os.stat(path)
+        except OSError:
+            return None
+        return (st.st_mtime_ns, st.st_size)
+
+    def get(self, path, load):
+        """
+        Cached value for `path`, else load() -> (value, valid_until). valid_until
+        (epoch seconds, or None for never) covers results that age without the
+        file changing, e.g. an agent going from working to idle.
+        """
+        path = os.fspath(path)
+        key = self.stat_key(path)
+        entry = self.entries.get(path)
+        if entry and entry[0] == key and (entry[2] is None or time.time() < entry[2]):
+            return entry[1]
+
+        with self.lock:
+            value, valid_until = load()
+            self.entries[path] = (key, value, valid_until)
+            return value
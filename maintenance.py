@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+🍃 Anime Office Maintenance
+Rolls old activity_log / system_metrics rows into hourly and daily aggregates
+and deletes the raw rows, in small batches so it can run next to the sync daemon.
+Then creates upcoming monthly partitions and detaches expired ones.
+"""
+
+import os
+import time
+from supabase import create_client, Client
+from dotenv import load_dotenv
+
+# Load environment variables
+load_dotenv()
+
+# ======== Configuration ========
+SUPABASE_URL = os.getenv("SUPABASE_URL", "")
+# Deleting through RLS-protected tables needs the service role key
+SUPABASE_KEY = os.getenv("SUPABASE_SERVICE_KEY", os.getenv("SUPABASE_KEY", ""))
+RETENTION_RAW_DAYS = int(os.getenv("RETENTION_RAW_DAYS", "30"))        # raw rows kept this long
+RETENTION_HOURLY_DAYS = int(os.getenv("RETENTION_HOURLY_DAYS", "180"))  # hourly aggregates kept this long
+RETENTION_BATCH_SIZE = int(os.getenv("RETENTION_BATCH_SIZE", "5000"))   # rows per table per batch
+RETENTION_MAX_BATCHES = int(os.getenv("RETENTION_MAX_BATCHES", "1000"))
+RETENTION_PAUSE = float(os.getenv("RETENTION_PAUSE", "0.2"))            # seconds between batches
+PARTITION_MONTHS_AHEAD = int(os.getenv("PARTITION_MONTHS_AHEAD", "3"))  # monthly partitions created in advance
+ACTIVITY_KEEP_MONTHS = int(os.getenv("ACTIVITY_KEEP_MONTHS", "2"))      # activity_log partitions attached
+HISTORY_KEEP_MONTHS = int(os.getenv("HISTORY_KEEP_MONTHS", "12"))       # agent_status_history partitions attached
+
+def get_supabase_client() -> Client:
+    """Initialize Supabase client"""
+    if not SUPABASE_URL or not SUPABASE_KEY:
+        print("⚠️  Supabase credentials not configured.")
+        return None
+    return create_client(SUPABASE_URL, SUPABASE_KEY)
+
+def run_retention(supabase: Client):
+    """Call run_retention_batch() until nothing is left to roll up"""
+    totals = {}
+    params = {
+        "raw_age": f"{RETENTION_RAW_DAYS} days",
+        "hourly_age": f"{RETENTION_HOURLY_DAYS} days",
+        "batch_size": RETENTION_BATCH_SIZE,
+    }
+
+    for batch in range(1, RETENTION_MAX_BATCHES + 1):
+        counts = supabase.rpc("run_retention_batch", params).execute().data or {}
+        for table, count in counts.items():
+            totals[table] = totals.get(table, 0) + count
+        print(f"🧹 Batch {batch}: " + ", ".join(f"{table} {count}" for table, count in counts.items()))
+        if not any(counts.values()):
+            break
+        time.sleep(RETENTION_PAUSE)
+    else:
+        print(f"⚠️  Stopped after {RETENTION_MAX_BATCHES} batches; run again to continue")
+
+    return totals
+
+def maintain_partitions(supabase: Client):
+    """Create upcoming monthly partitions and detach expired ones"""
+    result = supabase.rpc("maintain_time_partitions", {
+        "months_ahead": PARTITION_MONTHS_AHEAD,
+        "activity_keep_months": ACTIVITY_KEEP_MONTHS,
+        "history_keep_months": HISTORY_KEEP_MONTHS,
+    }).execute().data or {}
+    print("🗂️  Partitions: " + ", ".join(f"{name} {count}" for name, count in result.items()))
+    return result
+
+def main():
+    print("🍃 Starting retention & rollup...")
+    print(f"📅 Raw rows: {RETENTION_RAW_DAYS} days, hourly aggregates: {RETENTION_HOURLY_DAYS} days")
+
+    supabase = get_supabase_client()
+    if not supabase:
+        return
+
+    # Roll up first so expired partitions are empty (and dropped) when detached
+    totals = run_retention(supabase)
+    maintain_partitions(supabase)
+    print("\n✅ Maintenance complete! Rolled up: " + ", ".join(f"{table} {count}" for table, count in totals.items()))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+-- One-time migration: convert an existing unpartitioned activity_log into the
+-- monthly-partitioned layout from supabase_schema.sql.
+-- Run supabase_schema.sql first (it defines ensure_time_partitions), then this.
+-- Stop the sync daemon while it runs; its outbox keeps queued writes meanwhile.
+-- Custom RLS policies on the old table must be recreated afterwards.
+-- ensure_time_partitions enables RLS on every partition it creates: the parent's
+-- RLS does not apply when a partition is queried directly.
+
+BEGIN;
+
+DROP INDEX IF EXISTS idx_activity_log_recorded_at;
+ALTER TABLE activity_log RENAME TO activity_log_unpartitioned;
+ALTER TABLE activity_log_unpartitioned RENAME CONSTRAINT activity_log_pkey TO activity_log_unpartitioned_pkey;
+
+CREATE TABLE activity_log (
+    id UUID NOT NULL DEFAULT gen_random_uuid(),
+    agent_name TEXT,
+    activity_type TEXT NOT NULL,
+    description TEXT,
+    metadata JSONB DEFAULT '{}'::jsonb,
+    recorded_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+    PRIMARY KEY (id, recorded_at)
+) PARTITION BY RANGE (recorded_at);
+
+ALTER TABLE activity_log ENABLE ROW LEVEL SECURITY;
+CREATE INDEX IF NOT EXISTS idx_activity_log_recorded_at ON activity_log(recorded_at DESC);
+
+-- Partitions for every month that already has rows, plus the months ahead
+SELECT ensure_time_partitions('activity_log', 3, COALESCE((SELECT MIN(recorded_at) FROM activity_log_unpartitioned), NOW()));
+
+INSERT INTO activity_log (id, agent_name, activity_type, description, metadata, recorded_at)
+SELECT id, agent_name, activity_type, description, metadata, COALESCE(recorded_at, NOW())
+FROM activity_log_unpartitioned;
+
+DROP TABLE activity_log_unpartitioned;
+
+-- The publication listed the old table, which went with the DROP: publish the new one
+DO $$
+BEGIN
+    IF NOT EXISTS (SELECT 1 FROM pg_publication WHERE pubname = 'supabase_realtime') THEN
+        RAISE NOTICE 'publication supabase_realtime not found, skipping (not a Supabase database?)';
+        RETURN;
+    END IF;
+    ALTER PUBLICATION supabase_realtime SET (publish_via_partition_root = true);
+    IF NOT EXISTS (
+        SELECT 1 FROM pg_publication_tables
+        WHERE pubname = 'supabase_realtime' AND schemaname = 'public' AND tablename = 'activity_log'
+    ) THEN
+        ALTER PUBLICATION supabase_realtime ADD TABLE activity_log;
+    END IF;
+END $$;
+
+COMMIT;
@@ -0,0 +1,162 @@
+"""
+🍃 Office Records
+The one place OpenClaw sessions and cron jobs become typed records and get
+a status. The sync scripts and the dashboard shape these into their own rows.
+"""
+
+from dataclasses import dataclass
+from datetime import datetime, timezone
+
+import numpy as np
+
+# ======== Configuration ========
+WORKING_WINDOW_MS = 5 * 60 * 1000   # updated within this = working
+IDLE_WINDOW_MS = 30 * 60 * 1000     # within this = idle, older = completed
+PAYLOAD_MESSAGE_CHARS = 500         # longest payload excerpt any consumer stores
+
+def now_ms():
+    return datetime.now(timezone.utc).timestamp() * 1000
+
+# ======== Status Classification ========
+# Vectorised over whole columns against one reference time; statuses come
+# back as int8 codes indexing AGENT_STATUSES / CRON_STATUSES, with counts.
+AGENT_STATUSES = ("working", "idle", "completed")
+CRON_STATUSES = ("stopped", "failed", "running", "pending")
+WORKING, IDLE, COMPLETED = range(3)
+STOPPED, FAILED, RUNNING, PENDING = range(4)
+
+def status_counts(codes, statuses):
+    """{status: count} for every status, zeros included"""
+    return dict(zip(statuses, np.bincount(codes, minlength=len(statuses)).tolist()))
+
+def agent_status_codes(updated_at_ms, now=None):
+    """(codes, counts): working / idle / completed for each updatedAt (epoch ms)"""
+    now = now_ms() if now is None else now
+    updated = np.asarray(updated_at_ms, dtype=np.float64)
+    codes = np.full(updated.shape, COMPLETED, dtype=np.int8)
+    codes[updated > now - IDLE_WINDOW_MS] = IDLE
+    codes[updated > now - WORKING_WINDOW_MS] = WORKING
+    return codes, status_counts(codes, AGENT_STATUSES)
+
+def cron_status_codes(enabled, last_status, next_run_ms, now=None):
+    """
+    (codes, counts): stopped / failed / running / pending per job, from
+    parallel columns. A job that ran ok and whose next run is not in the
+    future is running; one that has never run is pending.
+    """
+    now = now_ms() if now is None else now
+    enabled = np.asarray(enabled, dtype=bool)
+    last_status = np.asarray(last_status, dtype=object)
+    next_run = np.asarray(next_run_ms, dtype=np.float64)
+    codes = np.full(enabled.shape, PENDING, dtype=np.int8)
+    codes[(last_status == "ok") & ~(next_run > now)] = RUNNING
+    codes[last_status == "error"] = FAILED
+    codes[~enabled] = STOPPED
+    return codes, status_counts(codes, CRON_STATUSES)
+
+def classify_crons(enabled, last_status, next_run_ms, now=None):
+    """Status names for each job"""
+    codes, _ = cron_status_codes(enabled, last_status, next_run_ms, now)
+    return [CRON_STATUSES[c] for c in codes.tolist()]
+
+def classify_cron(enabled, last_status, next_run_ms, now=None):
+    return classify_crons([enabled], [last_status], [next_run_ms], now)[0]
+
+# ======== Records ========
+@dataclass(slots=True)
+class AgentRecord:
+    """One OpenClaw session"""
+    session_key: str
+    status: str
+    updated_at_ms: int = 0
+    session_id: str = ""
+    task_name: str = "Active session"
+    thinking_level: str = "normal"
+    skills_count: int = 0
+
+@dataclass(slots=True)
+class CronRecord:
+    """One OpenClaw cron job; string fields are "" and times 0 when unset"""
+    job_id: str
+    name: str
+    status: str
+    enabled: bool = True
+    schedule_expr: str = ""
+    timezone: str = ""
+    session_target: str = ""
+    wake_mode: str = ""
+    payload_message: str = ""
+    model: str = ""
+    delivery_mode: str = ""
+    delivery_channel: str = ""
+    delivery_target: str = ""
+    last_status: str = ""
+    last_run_ms: int = 0
+    last_duration_ms: int = 0
+    consecutive_errors: int = 0
+    next_run_ms: int = 0
+
+def agent_batch(sessions_data, now=None):
+    """
+    (AgentRecords, per-status counts) from {session_key: session_info}
+    (sessions.json or read_sessions_data()), classified in one pass
+    """
+    items = list(sessions_data.items())
+    updated = [info.get("updatedAt") or 0 for _, info in items]
+    codes, counts = agent_status_codes(updated, now)
+    records = [
+        AgentRecord(
+            session_key=key,
+            status=AGENT_STATUSES[code],
+            updated_at_ms=updated_at,
+            session_id=info.get("sessionId") or "",
+            task_name=info.get("currentTask", "Active session"),
+            thinking_level=info.get("thinkingLevel", "normal"),
+            skills_count=info.get("skillsCount", 0),
+        )
+        for (key, info), updated_at, code in zip(items, updated, codes.tolist())
+    ]
+    return records, counts
+
+def agent_records(sessions_data, now=None):
+    return agent_batch(sessions_data, now)[0]
+
+def cron_batch(jobs_data, now=None):
+    """(CronRecords, per-status counts) from jobs.json's {"jobs": [...]}, classified in one pass"""
+    jobs = jobs_data.get("jobs", [])
+    states = [job.get("state", {}) for job in jobs]
+    codes, counts = cron_status_codes(
+        [job.get("enabled", True) for job in jobs],
+        [state.get("lastStatus") for state in states],
+        [state.get("nextRunAtMs") or 0 for state in states],
+        now,
+    )
+    records = []
+    for job, state, code in zip(jobs, states, codes.tolist()):
+        schedule = job.get("schedule", {})
+        payload = job.get("payload", {})
+        delivery = job.get("delivery", {})
+        records.append(CronRecord(
+            job_id=job.get("id", ""),
+            name=job.get("name", ""),
+            status=CRON_STATUSES[code],
+            enabled=job.get("enabled", True),
+            schedule_expr=schedule.get("expr", ""),
+            timezone=schedule.get("tz", ""),
+            session_target=job.get("sessionTarget", ""),
+            wake_mode=job.get("wakeMode", ""),
+            payload_message=(payload.get("message") or "")[:PAYLOAD_MESSAGE_CHARS],
+            model=payload.get("model", ""),
+            delivery_mode=delivery.get("mode", ""),
+            delivery_channel=delivery.get("channel", ""),
+            delivery_target=delivery.get("to", ""),
+            last_status=state.get("lastStatus") or "",
+            last_run_ms=state.get("lastRunAtMs") or 0,
+            last_duration_ms=state.get("lastDurationMs") or 0,
+            consecutive_errors=state.get("consecutiveErrors") or 0,
+            next_run_ms=state.get("nextRunAtMs") or 0,
+        ))
+    return records, counts
+
+def cron_records(jobs_data, now=None):
+    return cron_batch(jobs_data, now)[0]
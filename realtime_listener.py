@@ -0,0 +1,175 @@
+"""
+🍃 Realtime Listener
+One background websocket per process, subscribed to Supabase Realtime
+postgres_changes (Phoenix channel protocol). Changes land in a shared
+in-memory store that every dashboard session reads from.
+"""
+
+import asyncio
+import json
+import threading
+from collections import deque
+from urllib.parse import urlencode, urlparse
+
+try:
+    import websockets
+except ImportError:  # normally installed with supabase's realtime client
+    websockets = None
+
+# ======== Configuration ========
+HEARTBEAT_SECONDS = 25      # Realtime drops sockets silent for ~60s
+RECONNECT_MAX_SECONDS = 30  # backoff cap between reconnect attempts
+DEFAULT_LOG_SIZE = 50       # rows kept per append-only table (activity feed)
+
+def realtime_url(supabase_url, api_key):
+    """Websocket endpoint for a Supabase project URL"""
+    parsed = urlparse(supabase_url)
+    scheme = "wss" if parsed.scheme == "https" else "ws"
+    return f"{scheme}://{parsed.netloc}/realtime/v1/websocket?" + urlencode({"apikey": api_key, "vsn": "1.0.0"})
+
+# ======== Store ========
+class RealtimeStore:
+    """Rows keyed by id for tables that are updated in place, newest-first logs for append-only ones"""
+
+    def __init__(self, keyed_tables, log_tables=(), log_size=DEFAULT_LOG_SIZE):
+        # keyed_tables: {table: "col,col,..."} - only those columns are kept
+        self.columns = {table: columns.split(",") for table, columns in keyed_tables.items()}
+        self.rows = {table: {} for table in keyed_tables}
+        self.logs = {table: deque(maxlen=log_size) for table in log_tables}
+        self.version = 0
+        self.lock = threading.Lock()
+
+    def _project(self, table, record):
+        columns = self.columns.get(table)
+        return {c: record.get(c) for c in columns} if columns else dict(record)
+
+    def seed(self, table, rows):
+        """Replace a table's contents (initial load, and after every reconnect)"""
+        with self.lock:
+            if table in self.rows:
+                self.rows[table] = {row["id"]: self._project(table, row) for row in rows}
+            else:
+                self.logs[table].clear()
+                self.logs[table].extend(rows)
+            self.version += 1
+
+    def apply(self, table, change_type, record, old_record):
+        """Apply one INSERT/UPDATE/DELETE from the change feed"""
+        with self.lock:
+            if table in self.rows:
+                if change_type == "DELETE":
+                    self.rows[table].pop((old_record or {}).get("id"), None)
+                elif record:
+                    self.rows[table][record["id"]] = self._project(table, record)
+            elif table in self.logs and change_type == "INSERT" and record:
+                self.logs[table].appendleft(record)
+            else:
+                return
+            self.version += 1
+
+    def snapshot(self, table):
+        """Copy of a table's rows (newest first for logs)"""
+        with self.lock:
+            if table in self.rows:
+                return list(self.rows[table].values())
+            return list(self.logs[table])
+
+# ======== Listener ========
+class RealtimeListener:
+    """Keeps one Phoenix channel joined to postgres_changes, reconnecting with backoff"""
+
+    def __init__(self, url, tables, api_key=None, on_change=None, on_connect=None,
+                 schema="public", topic="realtime:dashboard"):
+        if websockets is None:
+            raise RuntimeError("websockets is not installed (pip install websockets)")
+        self.url = url
+        self.tables = list(tables)
+        self.api_key = api_key
+        self.on_change = on_change
+        self.on_connect = on_connect
+        self.schema = schema
+        self.topic = topic
+        self.connected = False
+        self.ref = 0
+        self.loop = None
+        self.task = None
+        self.thread = None
+
+    def start(self):
+        self.thread = threading.Thread(target=self._thread_main, name="realtime-listener", daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        if self.loop and self.task:
+            self.loop.call_soon_threadsafe(self.task.cancel)
+        if self.thread:
+            self.thread.join(timeout=5)
+
+    def _thread_main(self):
+        try:
+            asyncio.run(self._run())
+        except asyncio.CancelledError:
+            pass  # stop()
+
+    def _message(self, topic, event, payload):
+        self.ref += 1
+        return json.dumps({"topic": topic, "event": event, "payload": payload, "ref": str(self.ref)})
+
+    async def _run(self):
+        self.loop = asyncio.get_running_loop()
+        self.task = asyncio.current_task()
+        delay = 1
+        while True:
+            try:
+                await self._session()
+                delay = 1
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                print(f"⚠️  Realtime: {e}; reconnecting in {delay}s")
+            finally:
+                self.connected = False
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, RECONNECT_MAX_SECONDS)
+
+    async def _session(self):
+        async with websockets.connect(self.url) as ws:
+            await self._join(ws)
+            self.connected = True
+            if self.on_connect:
+                # Reload after joining so nothing between the load and the feed is lost
+                await asyncio.to_thread(self.on_connect)
+            heartbeat = asyncio.create_task(self._heartbeat(ws))
+            try:
+                async for raw in ws:
+                    self._handle(json.loads(raw))
+            finally:
+                heartbeat.cancel()
+
+    async def _join(self, ws):
+        config = {"postgres_changes": [{"event": "*", "schema": self.schema, "table": t} for t in self.tables]}
+        payload = {"config": config}
+        if self.api_key:
+            payload["access_token"] = self.api_key
+        await ws.send(self._message(self.topic, "phx_join", payload))
+        join_ref = str(self.ref)
+        while True:
+            reply = json.loads(await ws.recv())
+            if reply.get("event") == "phx_reply" and reply.get("ref") == join_ref:
+                if reply["payload"].get("status") != "ok":
+                    raise RuntimeError(f"join rejected: {reply['payload'].get('response')}")
+                return
+
+    async def _heartbeat(self, ws):
+        while True:
+            await asyncio.sleep(HEARTBEAT_SECONDS)
+            await ws.send(self._message("phoenix", "heartbeat", {}))
+
+    def _handle(self, message):
+        event = message.get("event")
+        if event in ("phx_error", "phx_close") and message.get("topic") == self.topic:
+            raise RuntimeError(f"channel closed ({event})")
+        if event != "postgres_changes" or not self.on_change:
+            return
+        data = message.get("payload", {}).get("data", {})
+        self.on_change(data.get("table"), data.get("type"), data.get("record"), data.get("old_record"))
@@ -0,0 +1,170 @@
+"""
+🍃 Session Index Reader
+Streams OpenClaw's sessions.json one top-level entry at a time and keeps
+only the fields the dashboard uses. skillsSnapshot.skills is counted, not
+built, so memory stays flat however large the file grows.
+"""
+
+import json
+import re
+
+# ======== Configuration ========
+CHUNK_SIZE = 64 * 1024
+SCALAR_FIELDS = ("updatedAt", "sessionId", "thinkingLevel")
+
+_WHITESPACE = re.compile(r"\s*")
+_STRING = re.compile(r'"(?:[^"\\]|\\.)*"', re.S)
+_SCALAR_END = re.compile(r"[,}\]\s]")
+# A whole string (or one the chunk end cut off, which runs to the end) or a bracket
+_SKIP_TOKEN = re.compile(r'"(?:[^"\\]|\\.)*(?:"|\\?\Z)|[{}\[\]]', re.S)
+
+class _Scanner:
+    """Just enough of a JSON tokenizer to walk objects and skip values unparsed"""
+
+    def __init__(self, f):
+        self.f = f
+        self.buf = ""
+        self.pos = 0
+
+    def _fill(self):
+        """Drop consumed text and read the next chunk; False at end of file"""
+        chunk = self.f.read(CHUNK_SIZE)
+        self.buf = self.buf[self.pos:] + chunk
+        self.pos = 0
+        return bool(chunk)
+
+    def peek(self):
+        """Next non-whitespace character (not consumed)"""
+        while True:
+            self.pos = _WHITESPACE.match(self.buf, self.pos).end()
+            if self.pos < len(self.buf):
+                return self.buf[self.pos]
+            if not self._fill():
+                raise ValueError("unexpected end of JSON")
+
+    def expect(self, char):
+        if self.peek() != char:
+            raise ValueError(f"expected {char!r} at {self.buf[self.pos:self.pos + 20]!r}")
+        self.pos += 1
+
+    def string(self):
+        self.peek()
+        while True:
+            match = _STRING.match(self.buf, self.pos)
+            if match:
+                self.pos = match.end()
+                return json.loads(match.group())
+            if not self._fill():
+                raise ValueError(f"bad string at {self.buf[self.pos:self.pos + 20]!r}")
+
+    def _scalar_token(self):
+        """Number / true / false / null text, read until a delimiter so it can't be cut off"""
+        self.peek()
+        while True:
+            end = _SCALAR_END.search(self.buf, self.pos)
+            if end or not self._fill():
+                break
+        end = end.start() if end else len(self.buf)
+        token = self.buf[self.pos:end]
+        self.pos = end
+        return token
+
+    def scalar(self):
+        """A string, number, true/false/null; containers are skipped and read as None"""
+        char = self.peek()
+        if char == '"':
+            return self.string()
+        if char in "{[":
+            self.skip()
+            return None
+        return json.loads(self._scalar_token())
+
+    def skip(self):
+        """Consume one value without building it"""
+        if self.peek() not in '"{[':
+            self._scalar_token()
+            return
+
+        depth = 0
+        i = self.pos
+        while True:
+            match = _SKIP_TOKEN.search(self.buf, i)
+            if match is None or match.end() >= len(self.buf):
+                # Nothing, or a token the chunk end may have cut off: keep it and read on
+                self.pos = match.start() if match else len(self.buf)
+                if not self._fill():
+                    raise ValueError("unexpected end of JSON")
+                i = 0
+                continue
+            token = match.group()
+            if token[0] != '"':
+                depth += 1 if token in "{[" else -1
+            i = match.end()
+            if depth == 0:
+                self.pos = i
+                return
+
+    def members(self):
+        """Yield each key of an object; the caller consumes its value"""
+        self.expect("{")
+        if self.peek() == "}":
+            self.pos += 1
+            return
+        while True:
+            key = self.string()
+            self.expect(":")
+            yield key
+            char = self.peek()
+            self.pos += 1
+            if char == "}":
+                return
+            if char != ",":
+                raise ValueError(f"expected ',' or '}}', got {char!r}")
+
+    def count_items(self):
+        """Number of elements in an array, each skipped unparsed"""
+        self.expect("[")
+        if self.peek() == "]":
+            self.pos += 1
+            return 0
+        count = 0
+        while True:
+            self.skip()
+            count += 1
+            char = self.peek()
+            self.pos += 1
+            if char == "]":
+                return count
+            if char != ",":
+                raise ValueError(f"expected ',' or ']', got {char!r}")
+
+def _project_entry(scanner):
+    """updatedAt / sessionId / thinkingLevel plus skillsCount from one session entry"""
+    entry = {}
+    if scanner.peek() != "{":
+        scanner.skip()
+        return entry
+
+    for field in scanner.members():
+        if field in SCALAR_FIELDS:
+            entry[field] = scanner.scalar()
+        elif field == "skillsSnapshot" and scanner.peek() == "{":
+            for snapshot_field in scanner.members():
+                if snapshot_field == "skills" and scanner.peek() == "[":
+                    entry["skillsCount"] = scanner.count_items()
+                else:
+                    scanner.skip()
+        else:
+            scanner.skip()
+    return entry
+
+def iter_session_index(path):
+    """Yield (session_key, projected entry) for each top-level entry of sessions.json"""
+    with open(path, 'r', encoding='utf-8') as f:
+        scanner = _Scanner(f)
+        for key in scanner.members():
+            yield key, _project_entry(scanner)
+
+def read_session_index(path):
+    """{session_key: {"updatedAt", "sessionId", "thinkingLevel", "skillsCount"}}"""
+    return dict(iter_session_index(path))
@@ -0,0 +1,167 @@
+"""
+🍃 OpenClaw Session Reader
+Shared helpers for reading the latest state out of session .jsonl transcripts
+"""
+
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from pathlib import Path
+from datetime import datetime, timezone
+
+# ======== Configuration ========
+TAIL_BLOCK_SIZE = 64 * 1024  # bytes read per backward seek
+SESSION_READ_WORKERS = int(os.getenv("SESSION_READ_WORKERS", "1"))  # >1 shards parsing across a pool
+SESSION_READ_EXECUTOR = os.getenv("SESSION_READ_EXECUTOR", "process")  # "process" or "thread"
+
+# ======== Parsing Helpers ========
+def parse_timestamp(ts):
+    """Parse various timestamp formats"""
+    if not ts:
+        return datetime.now(timezone.utc).timestamp() * 1000
+
+    # If it's already a number
+    if isinstance(ts, (int, float)):
+        return ts
+
+    # If it's a string, try to parse
+    if isinstance(ts, str):
+        try:
+            # Try ISO format
+            if 'T' in ts:
+                dt = datetime.fromisoformat(ts.replace('Z', '+00:00'))
+                return dt.timestamp() * 1000
+            # Try Unix timestamp string
+            return float(ts) * 1000
+        except:
+            return datetime.now(timezone.utc).timestamp() * 1000
+
+    return datetime.now(timezone.utc).timestamp() * 1000
+
+def is_session_file(path):
+    """Skip deleted transcripts and lock files"""
+    return ".deleted." not in path.name and ".lock" not in path.name
+
+def entry_fields(record):
+    """Just the parts of a transcript record session_entry reads, for keeping in state"""
+    fields = {"timestamp": record.get("timestamp")}
+    if "content" in record:
+        fields["content"] = record["content"][:100]
+    return fields
+
+def session_entry(session_id, record):
+    """Build the sessions dict entry from the last transcript record"""
+    return {
+        "sessionId": session_id,
+        "updatedAt": parse_timestamp(record.get("timestamp")),
+        "currentTask": record.get("content", "")[:100] if "content" in record else "Active session",
+    }
+
+# ======== Tail Reading ========
+def find_last_record(file, end, block_size=TAIL_BLOCK_SIZE, start=0):
+    """
+    Seek backward from `end` in fixed-size blocks until the last complete
+    JSON line is found, never reading before `start` (which must be a line
+    boundary). Returns (record, offset just past that line).
+
+    A trailing fragment without a newline is a line still being written:
+    it is used only if it already parses, otherwise we fall back to the
+    line before it.
+    """
+    pos = end
+    tail = b""
+    line_end = end
+
+    while pos > start:
+        read_size = min(block_size, pos - start)
+        pos -= read_size
+        file.seek(pos)
+        tail = file.read(read_size) + tail
+
+        # Only lines whose start we have seen can be parsed
+        while True:
+            cut = tail.rfind(b"\n", 0, len(tail) - 1 if tail.endswith(b"\n") else len(tail))
+            if cut < 0:
+                break
+            line = tail[cut + 1:]
+            tail = tail[:cut + 1]
+            record, ok = _parse_line(line, line_end == end)
+            if ok:
+                return record, line_end
+            line_end -= len(line)
+
+    if tail:
+        record, ok = _parse_line(tail, line_end == end)
+        if ok:
+            return record, line_end
+    return None, start
+
+def _parse_line(line, is_last):
+    """Parse one raw line; (None, False) means keep searching backward"""
+    text = line.strip()
+    if not text:
+        return None, False
+    try:
+        return json.loads(text), True
+    except ValueError:
+        # Unterminated tail is a partial write, anything else is corrupt
+        if is_last and not line.endswith(b"\n"):
+            return None, False
+        raise
+
+def read_last_record(path, block_size=TAIL_BLOCK_SIZE):
+    """Read the last complete JSON record of a .jsonl file (None if empty)"""
+    with open(path, 'rb') as f:
+        end = f.seek(0, os.SEEK_END)
+        record, _ = find_last_record(f, end, block_size)
+    return record
+
+# ======== Session Directory ========
+def _read_shard(paths):
+    """Parse one shard of session files (runs inside a pool worker)"""
+    sessions = {}
+    for path in paths:
+        path = Path(path)
+        try:
+            record = read_last_record(path)
+            if record is not None:
+                sessions[path.stem] = session_entry(path.stem, record)
+        except Exception as e:
+            print(f"⚠️  Error reading {path.name}: {e}")
+    return sessions
+
+def read_sessions_data(sessions_dir, workers=None, executor=None):
+    """
+    Read OpenClaw sessions from .jsonl files. With workers > 1 the files are
+    sharded across a process (or thread) pool and merged into one dict.
+    """
+    workers = SESSION_READ_WORKERS if workers is None else workers
+    executor = executor or SESSION_READ_EXECUTOR
+    sessions_dir = Path(sessions_dir)
+
+    if not sessions_dir.exists():
+        return {}
+
+    paths = [str(f) for f in sessions_dir.glob("*.jsonl") if is_session_file(f)]
+    return read_sharded(_read_shard, paths, workers, executor)
+
+def read_sharded(read_shard, items, workers=None, executor=None):
+    """
+    Merged dicts from read_shard(list of items) (a picklable module-level
+    function), with the items sharded across a pool when workers > 1
+    """
+    workers = SESSION_READ_WORKERS if workers is None else workers
+    executor = executor or SESSION_READ_EXECUTOR
+    if workers <= 1 or len(items) < 2:
+        return read_shard(items)
+
+    # A few shards per worker keeps the pool balanced without much IPC
+    shard_count = min(len(items), workers * 4)
+    shards = [items[i::shard_count] for i in range(shard_count)]
+    pool_class = ThreadPoolExecutor if executor == "thread" else ProcessPoolExecutor
+
+    merged = {}
+    with pool_class(max_workers=workers) as pool:
+        for shard_result in pool.map(read_shard, shards):
+            merged.update(shard_result)
+    return merged
@@ -0,0 +1,181 @@
+"""
+🍃 OpenClaw Incremental Session Scanner
+Keeps per-file (inode, size, mtime, offset, last record's entry fields)
+state on disk so unchanged transcripts cost one stat per cycle, even across
+daemon restarts
+"""
+
+import json
+import os
+from pathlib import Path
+
+from session_reader import entry_fields, find_last_record, is_session_file, read_sharded, session_entry
+
+STATE_VERSION = 2  # 1 kept whole records
+POOL_MIN_READS = 64  # fewer re-reads than this (a normal cycle) aren't worth starting a pool
+
+def _read_tails(reads):
+    """
+    {name: (entry fields or None, offset, error)} for (name, path, size, start)
+    reads; module-level so a process pool can run it on a shard
+    """
+    results = {}
+    for name, path, size, start in reads:
+        try:
+            with open(path, 'rb') as f:
+                record, offset = find_last_record(f, size, start=start)
+            results[name] = (entry_fields(record) if record is not None else None, offset, None)
+        except Exception as e:
+            results[name] = (None, start, str(e))
+    return results
+
+class SessionScanner:
+    """Incrementally tracks the last record of every session .jsonl file"""
+
+    def __init__(self, sessions_dir, state_file, workers=None, executor=None):
+        self.sessions_dir = Path(sessions_dir)
+        self.state_file = Path(state_file)
+        self.workers = workers      # None = SESSION_READ_WORKERS: re-reads (e.g. the cold start) are
+        self.executor = executor    # sharded across a pool like session_reader.read_sessions_data
+        self.files = {}
+        self.dirty = False
+        self.load()
+
+    # ======== State Persistence ========
+    def load(self):
+        """Load saved per-file state (a missing or corrupt file means a fresh scan)"""
+        try:
+            with open(self.state_file, 'r') as f:
+                state = json.load(f)
+            if state.get("version") == STATE_VERSION:
+                self.files = state.get("files", {})
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            print(f"⚠️  Ignoring scanner state {self.state_file}: {e}")
+
+    def save(self):
+        """Atomically persist per-file state if anything changed"""
+        if not self.dirty:
+            return
+        self.state_file.parent.mkdir(parents=True, exist_ok=True)
+        tmp_file = self.state_file.with_suffix(".tmp")
+        with open(tmp_file, 'w') as f:
+            json.dump({"version": STATE_VERSION, "files": self.files}, f)
+        os.replace(tmp_file, self.state_file)
+        self.dirty = False
+
+    # ======== Scanning ========
+    def scan(self):
+        """
+        Stat every session file and re-read only new, grown, truncated or
+        rotated ones. Returns (sessions, changed_session_ids).
+        """
+        changed = set()
+        seen = set()
+        stats = {}
+
+        if not self.sessions_dir.exists():
+            return {}, changed
+
+        with os.scandir(self.sessions_dir) as entries:
+            for entry in entries:
+                path = Path(entry.path)
+                if path.suffix != ".jsonl" or not is_session_file(path):
+                    continue
+
+                seen.add(entry.name)
+                try:
+                    stats[entry.name] = entry.stat()
+                except OSError as e:
+                    print(f"⚠️  Error reading {entry.name}: {e}")
+
+        changed_names = self._update_files(stats)
+        sessions = {}
+        for name in stats:
+            session_id = Path(name).stem
+            info = self.files.get(name)
+            if info and info["record"] is not None:
+                sessions[session_id] = session_entry(session_id, info["record"])
+            if name in changed_names:
+                changed.add(session_id)
+
+        # Forget files that were deleted or renamed away
+        for name in list(self.files):
+            if name not in seen:
+                del self.files[name]
+                self.dirty = True
+
+        return sessions, changed
+
+    def scan_files(self, names):
+        """
+        Re-check only the given file names (e.g. reported by a watcher).
+        Returns {session_id: session} for sessions whose record changed.
+        """
+        stats = {}
+
+        for name in names:
+            path = self.sessions_dir / name
+            if path.suffix != ".jsonl" or not is_session_file(path):
+                continue
+
+            try:
+                stats[name] = path.stat()
+            except FileNotFoundError:
+                if self.files.pop(name, None) is not None:
+                    self.dirty = True
+
+        changed = {}
+        for name in self._update_files(stats):
+            record = self.files[name]["record"]
+            if record is not None:
+                changed[Path(name).stem] = session_entry(Path(name).stem, record)
+        return changed
+
+    def _update_files(self, stats):
+        """Refresh state for {name: stat}; returns the names whose record changed"""
+        reads = []
+        resumed = {}  # name -> record kept from the bytes already parsed
+        for name, st in stats.items():
+            prev = self.files.get(name)
+            if prev and prev["inode"] == st.st_ino and prev["size"] == st.st_size and prev["mtime_ns"] == st.st_mtime_ns:
+                continue
+
+            # Appended to the same file: only parse bytes past the last offset.
+            # A shrunk file or a new inode means truncation/rotation: start over.
+            if prev and prev["inode"] == st.st_ino and st.st_size >= prev["offset"] and st.st_size >= prev["size"]:
+                start = prev["offset"]
+                resumed[name] = prev["record"]
+            else:
+                start = 0
+            reads.append((name, str(self.sessions_dir / name), st.st_size, start))
+
+        changed = set()
+        workers = self.workers if len(reads) >= POOL_MIN_READS else 1
+        results = read_sharded(_read_tails, reads, workers, self.executor)
+        for name, _, size, start in reads:
+            new_record, offset, error = results[name]
+            if error:
+                print(f"⚠️  Error reading {name}: {error}")
+                continue
+
+            prev = self.files.get(name)
+            record = resumed.get(name)
+            if new_record is not None:
+                record = new_record
+            else:
+                offset = start
+
+            st = stats[name]
+            self.files[name] = {
+                "inode": st.st_ino,
+                "size": st.st_size,
+                "mtime_ns": st.st_mtime_ns,
+                "offset": offset,
+                "record": record,
+            }
+            self.dirty = True
+            if record != (prev or {}).get("record"):
+                changed.add(name)
+        return changed
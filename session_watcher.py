@@ -0,0 +1,150 @@
+"""
+🍃 OpenClaw File Watcher
+Reports which session/cron files changed, using Linux inotify when available
+and falling back to stat polling elsewhere
+"""
+
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import time
+from pathlib import Path
+
+# ======== Configuration ========
+DEBOUNCE_SECONDS = 0.2   # quiet period that ends a burst of writes
+MAX_BATCH_DELAY = 1.0    # never hold a burst longer than this
+POLL_INTERVAL = 1.0      # stat polling period for the fallback watcher
+
+# inotify(7) constants
+IN_MODIFY = 0x00000002
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_Q_OVERFLOW = 0x00004000
+IN_NONBLOCK = os.O_NONBLOCK
+IN_CLOEXEC = os.O_CLOEXEC
+WATCH_MASK = IN_MODIFY | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE
+EVENT_HEADER = struct.Struct("iIII")
+
+class InotifyWatcher:
+    """Watches directories with inotify; idle cost is a blocked select()"""
+
+    def __init__(self, directories):
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        if not hasattr(libc, "inotify_init1"):
+            raise OSError("inotify is not available on this platform")
+        self._libc = libc
+        self.fd = libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self.directories = {}
+        try:
+            for directory in directories:
+                directory = Path(directory)
+                wd = libc.inotify_add_watch(self.fd, os.fsencode(directory), WATCH_MASK)
+                if wd < 0:
+                    raise OSError(ctypes.get_errno(), f"Cannot watch {directory}")
+                self.directories[wd] = directory
+        except OSError:
+            self.close()
+            raise
+
+    def poll(self, timeout):
+        """Wait up to `timeout` seconds; returns the set of changed paths"""
+        ready, _, _ = select.select([self.fd], [], [], timeout)
+        if not ready:
+            return set()
+
+        changed = set()
+        while True:
+            try:
+                data = os.read(self.fd, 64 * 1024)
+            except BlockingIOError:
+                break
+            offset = 0
+            while offset < len(data):
+                wd, mask, _, name_len = EVENT_HEADER.unpack_from(data, offset)
+                offset += EVENT_HEADER.size
+                name = data[offset:offset + name_len].rstrip(b"\0")
+                offset += name_len
+                if mask & IN_Q_OVERFLOW:
+                    # Kernel dropped events: report every watched directory
+                    changed.update(self.directories.values())
+                elif wd in self.directories and name:
+                    changed.add(self.directories[wd] / os.fsdecode(name))
+        return changed
+
+    def close(self):
+        if self.fd >= 0:
+            os.close(self.fd)
+            self.fd = -1
+
+class PollingWatcher:
+    """Portable fallback that diffs directory stat snapshots"""
+
+    def __init__(self, directories, interval=POLL_INTERVAL):
+        self.directories = [Path(d) for d in directories]
+        self.interval = interval
+        self.snapshot = self._stat_all()
+
+    def _stat_all(self):
+        snapshot = {}
+        for directory in self.directories:
+            try:
+                with os.scandir(directory) as entries:
+                    for entry in entries:
+                        try:
+                            st = entry.stat()
+                        except FileNotFoundError:
+                            continue
+                        snapshot[Path(entry.path)] = (st.st_ino, st.st_size, st.st_mtime_ns)
+            except FileNotFoundError:
+                continue
+        return snapshot
+
+    def poll(self, timeout):
+        """Wait up to `timeout` seconds; returns the set of changed paths"""
+        deadline = time.monotonic() + timeout
+        while True:
+            current = self._stat_all()
+            changed = {p for p in current.keys() | self.snapshot.keys() if current.get(p) != self.snapshot.get(p)}
+            self.snapshot = current
+            remaining = deadline - time.monotonic()
+            if changed or remaining <= 0:
+                return changed
+            time.sleep(min(self.interval, remaining))
+
+    def close(self):
+        pass
+
+def create_watcher(directories):
+    """Prefer inotify, fall back to stat polling"""
+    try:
+        return InotifyWatcher(directories)
+    except (OSError, AttributeError) as e:
+        print(f"⚠️  inotify unavailable ({e}), falling back to polling")
+        return PollingWatcher(directories)
+
+def wait_for_changes(watcher, timeout, debounce=DEBOUNCE_SECONDS, max_delay=MAX_BATCH_DELAY):
+    """
+    Block until something changes (or `timeout` passes), then keep collecting
+    until writes go quiet for `debounce` seconds or `max_delay` is reached.
+    """
+    changed = watcher.poll(timeout)
+    if not changed:
+        return changed
+
+    deadline = time.monotonic() + max_delay
+    while True:
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            break
+        more = watcher.poll(min(debounce, remaining))
+        if not more:
+            break
+        changed |= more
+    return changed
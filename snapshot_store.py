@@ -0,0 +1,89 @@
+"""
+🍃 Snapshot Store
+One background refresher per process builds immutable snapshots of the
+dashboard data; every viewer reads the latest one without locking
+"""
+
+import threading
+import time
+from dataclasses import dataclass, field
+from types import MappingProxyType
+
+# ======== Configuration ========
+DEFAULT_REFRESH_SECONDS = 10
+
+def freeze_rows(rows):
+    """Tuple of read-only row mappings"""
+    return tuple(MappingProxyType(dict(row)) for row in rows)
+
+@dataclass(frozen=True)
+class Snapshot:
+    """Processed dashboard data as of `built_at`; version changes only when content does"""
+    version: int = 0
+    built_at: float = 0.0
+    agents: tuple = ()
+    crons: tuple = ()
+    stats: MappingProxyType = field(default_factory=lambda: MappingProxyType({}))
+    sources: MappingProxyType = field(default_factory=lambda: MappingProxyType({}))
+
+class SnapshotStore:
+    """Rebuilds the snapshot every `interval` seconds in a daemon thread"""
+
+    def __init__(self, build, interval=DEFAULT_REFRESH_SECONDS):
+        # build() -> {"agents": [...], "crons": [...], "stats": {...}, "sources": {...}},
+        # or None when it knows nothing changed
+        self.build = build
+        self.interval = interval
+        self.snapshot = Snapshot()
+        self.wakeup = threading.Event()
+        self.refreshed = threading.Event()
+        self.thread = None
+
+    def start(self):
+        # A bad first build leaves the empty snapshot; the refresher keeps retrying
+        self._refresh_or_keep()
+        self.thread = threading.Thread(target=self._loop, name="snapshot-refresher", daemon=True)
+        self.thread.start()
+
+    def current(self):
+        """Latest snapshot; a plain attribute read, replaced whole by the refresher"""
+        return self.snapshot
+
+    def request_refresh(self, timeout=None):
+        """Rebuild now instead of at the next interval; waits up to `timeout` seconds for it"""
+        self.refreshed.clear()
+        self.wakeup.set()
+        if timeout:
+            self.refreshed.wait(timeout)
+
+    def refresh(self):
+        data = self.build()
+        if data is None:
+            return
+        previous = self.snapshot
+        agents = freeze_rows(data.get("agents", []))
+        crons = freeze_rows(data.get("crons", []))
+        stats = MappingProxyType(dict(data.get("stats", {})))
+        sources = MappingProxyType(dict(data.get("sources", {})))
+        changed = (agents, crons, stats, sources) != (previous.agents, previous.crons, previous.stats, previous.sources)
+        self.snapshot = Snapshot(
+            version=previous.version + 1 if changed else previous.version,
+            built_at=time.time(),
+            agents=agents if changed else previous.agents,
+            crons=crons if changed else previous.crons,
+            stats=stats if changed else previous.stats,
+            sources=sources if changed else previous.sources,
+        )
+
+    def _loop(self):
+        while True:
+            self.wakeup.wait(self.interval)
+            self.wakeup.clear()
+            self._refresh_or_keep()
+            self.refreshed.set()
+
+    def _refresh_or_keep(self):
+        try:
+            self.refresh()
+        except Exception as e:
+            print(f"⚠️  Snapshot refresh failed, keeping version {self.snapshot.version}: {e}")
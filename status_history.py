@@ -0,0 +1,132 @@
+"""
+🍃 Agent Status History
+Records only agent status transitions (not 30-second snapshots) and rebuilds
+per-agent timelines and utilisation for any time window from them
+"""
+
+import json
+import os
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+# ======== Recording ========
+class StatusTransitionTracker:
+    """Last known status per agent, persisted so restarts don't re-log everyone"""
+
+    def __init__(self, state_file):
+        self.state_file = Path(state_file)
+        self.statuses = {}
+        self.dirty = False
+        try:
+            with open(self.state_file, 'r') as f:
+                self.statuses = json.load(f)
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            print(f"⚠️  Ignoring status history state {self.state_file}: {e}")
+
+    def save(self):
+        """Atomically persist statuses if anything changed"""
+        if not self.dirty:
+            return
+        self.state_file.parent.mkdir(parents=True, exist_ok=True)
+        tmp_file = self.state_file.with_suffix(".tmp")
+        with open(tmp_file, 'w') as f:
+            json.dump(self.statuses, f)
+        os.replace(tmp_file, self.state_file)
+        self.dirty = False
+
+    def prune(self, names):
+        """Forget agents that no longer exist (call after a full scan)"""
+        names = set(names)
+        for name in list(self.statuses):
+            if name not in names:
+                del self.statuses[name]
+                self.dirty = True
+
+    def transitions(self, agents):
+        """agent_status_history rows for agents whose status changed (or appeared)"""
+        now = datetime.now(timezone.utc).isoformat()
+        rows = []
+        for agent in agents:
+            name = agent["agent_name"]
+            previous = self.statuses.get(name)
+            if previous == agent["status"]:
+                continue
+            self.statuses[name] = agent["status"]
+            self.dirty = True
+            rows.append({
+                "agent_name": name,
+                "from_status": previous,
+                "to_status": agent["status"],
+                "task_name": agent.get("task_name", ""),
+                "recorded_at": now,
+            })
+        return rows
+
+# ======== Querying ========
+def _parse_time(value):
+    if isinstance(value, datetime):
+        return value if value.tzinfo else value.replace(tzinfo=timezone.utc)
+    return datetime.fromisoformat(value.replace('Z', '+00:00'))
+
+def fetch_status_transitions(supabase, window_start, window_end=None, lookback_days=30):
+    """
+    Transitions inside the window, plus each agent's last transition before it
+    (clipped to window_start) so timelines start with a known state.
+    """
+    window_end = window_end or datetime.now(timezone.utc)
+    result = supabase.rpc("agent_status_transitions", {
+        "window_start": _parse_time(window_start).isoformat(),
+        "window_end": _parse_time(window_end).isoformat(),
+        "lookback": f"{lookback_days} days",
+    }).execute()
+    return result.data or []
+
+def build_timelines(transitions, window_start, window_end):
+    """
+    {agent_name: [(status, start, end), ...]} covering the window. Time before
+    an agent's first known state is left out.
+    """
+    window_start = _parse_time(window_start)
+    window_end = _parse_time(window_end)
+    by_agent = {}
+    for row in transitions:
+        by_agent.setdefault(row["agent_name"], []).append((_parse_time(row["recorded_at"]), row["to_status"]))
+
+    timelines = {}
+    for agent, changes in by_agent.items():
+        changes.sort(key=lambda change: change[0])
+        segments = []
+        for i, (at, status) in enumerate(changes):
+            start = max(at, window_start)
+            end = min(changes[i + 1][0] if i + 1 < len(changes) else window_end, window_end)
+            if end <= start:
+                continue
+            if segments and segments[-1][0] == status and segments[-1][2] == start:
+                segments[-1] = (status, segments[-1][1], end)
+            else:
+                segments.append((status, start, end))
+        timelines[agent] = segments
+    return timelines
+
+def utilisation(timelines, window_start, window_end):
+    """{agent_name: {status: percent of window}}; the remainder is time with no known state"""
+    window_seconds = (_parse_time(window_end) - _parse_time(window_start)).total_seconds()
+    if window_seconds <= 0:
+        return {}
+
+    result = {}
+    for agent, segments in timelines.items():
+        totals = {}
+        for status, start, end in segments:
+            totals[status] = totals.get(status, 0.0) + (end - start).total_seconds()
+        result[agent] = {status: round(100 * seconds / window_seconds, 1) for status, seconds in totals.items()}
+    return result
+
+def agent_utilisation(supabase, hours=24):
+    """Convenience: utilisation over the last `hours` hours"""
+    window_end = datetime.now(timezone.utc)
+    window_start = window_end - timedelta(hours=hours)
+    transitions = fetch_status_transitions(supabase, window_start, window_end)
+    return utilisation(build_timelines(transitions, window_start, window_end), window_start, window_end)
@@ -45,29 +45,411 @@ CREATE TABLE IF NOT EXISTS system_metrics (
     recorded_at TIMESTAMPTZ DEFAULT NOW()
 );
 
--- 4. Activity Log Table
+-- 4. Activity Log Table (monthly partitions on recorded_at, see Time Partitioning below;
+--    existing unpartitioned installs: run migrate_partitions.sql once)
 CREATE TABLE IF NOT EXISTS activity_log (
-    id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+    id UUID NOT NULL DEFAULT gen_random_uuid(),
     agent_name TEXT,
     activity_type TEXT NOT NULL,
     description TEXT,
     metadata JSONB DEFAULT '{}'::jsonb,
-    recorded_at TIMESTAMPTZ DEFAULT NOW()
-);
+    recorded_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+    PRIMARY KEY (id, recorded_at)
+) PARTITION BY RANGE (recorded_at);
+
+-- 5. Agent Status History Table (status transitions, monthly partitions on recorded_at)
+CREATE TABLE IF NOT EXISTS agent_status_history (
+    id UUID NOT NULL DEFAULT gen_random_uuid(),
+    agent_name TEXT NOT NULL,
+    from_status TEXT,
+    to_status TEXT NOT NULL,
+    task_name TEXT,
+    recorded_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+    PRIMARY KEY (id, recorded_at)
+) PARTITION BY RANGE (recorded_at);
 
 -- Enable Row Level Security (optional, disable for testing)
 ALTER TABLE agent_status ENABLE ROW LEVEL SECURITY;
 ALTER TABLE cron_jobs ENABLE ROW LEVEL SECURITY;
 ALTER TABLE system_metrics ENABLE ROW LEVEL SECURITY;
 ALTER TABLE activity_log ENABLE ROW LEVEL SECURITY;
+ALTER TABLE agent_status_history ENABLE ROW LEVEL SECURITY;
 
 -- Create indexes for better query performance
-CREATE INDEX IF NOT EXISTS idx_agent_status_agent_name ON agent_status(agent_name);
+-- agent_name is unique so the sync daemon can batch upsert with on_conflict=agent_name
+-- (existing installs: remove duplicate agent_name rows before running this)
+DROP INDEX IF EXISTS idx_agent_status_agent_name;
+CREATE UNIQUE INDEX IF NOT EXISTS idx_agent_status_agent_name_key ON agent_status(agent_name);
 CREATE INDEX IF NOT EXISTS idx_agent_status_status ON agent_status(status);
 CREATE INDEX IF NOT EXISTS idx_cron_jobs_job_id ON cron_jobs(job_id);
 CREATE INDEX IF NOT EXISTS idx_cron_jobs_enabled ON cron_jobs(enabled);
+-- Keyset pagination (and delta fetches) in the dashboard walk (updated_at, id)
+CREATE INDEX IF NOT EXISTS idx_agent_status_updated_at_id ON agent_status(updated_at, id);
+CREATE INDEX IF NOT EXISTS idx_cron_jobs_updated_at_id ON cron_jobs(updated_at, id);
 CREATE INDEX IF NOT EXISTS idx_activity_log_recorded_at ON activity_log(recorded_at DESC);
 CREATE INDEX IF NOT EXISTS idx_system_metrics_recorded_at ON system_metrics(recorded_at DESC);
+CREATE INDEX IF NOT EXISTS idx_agent_status_history_agent ON agent_status_history(agent_name, recorded_at DESC);
+
+-- ======== Time Partitioning ========
+-- activity_log and agent_status_history are split into monthly partitions named
+-- <table>_pYYYYMM, so time-window queries only touch the months they cover
+-- and old months are detached instead of deleted row by row.
+-- maintenance.py calls maintain_time_partitions() to keep this rolling.
+
+-- Create monthly partitions from `since` through `months_ahead` months from now
+CREATE OR REPLACE FUNCTION ensure_time_partitions(
+    parent TEXT,
+    months_ahead INT DEFAULT 3,
+    since TIMESTAMPTZ DEFAULT NOW()
+) RETURNS INT AS $$
+DECLARE
+    month_start TIMESTAMPTZ := date_trunc('month', since);
+    last_month TIMESTAMPTZ := date_trunc('month', NOW()) + make_interval(months => months_ahead);
+    partition_name TEXT;
+    child RECORD;
+    created INT := 0;
+BEGIN
+    IF NOT EXISTS (SELECT 1 FROM pg_class WHERE oid = to_regclass(parent) AND relkind = 'p') THEN
+        RAISE NOTICE '% is not partitioned, skipping (see migrate_partitions.sql)', parent;
+        RETURN 0;
+    END IF;
+
+    WHILE month_start <= last_month LOOP
+        partition_name := parent || '_p' || to_char(month_start, 'YYYYMM');
+        IF to_regclass(partition_name) IS NULL THEN
+            EXECUTE format(
+                'CREATE TABLE %I PARTITION OF %I FOR VALUES FROM (%L) TO (%L)',
+                partition_name, parent, month_start, month_start + INTERVAL '1 month'
+            );
+            -- The parent's RLS doesn't cover a partition queried directly (e.g. via PostgREST)
+            EXECUTE format('ALTER TABLE %I ENABLE ROW LEVEL SECURITY', partition_name);
+            created := created + 1;
+        END IF;
+        month_start := month_start + INTERVAL '1 month';
+    END LOOP;
+
+    -- Catch-all for rows outside the prepared months; ensure_time_partitions
+    -- runs ahead of time so this normally stays empty
+    IF to_regclass(parent || '_default') IS NULL THEN
+        EXECUTE format('CREATE TABLE %I PARTITION OF %I DEFAULT', parent || '_default', parent);
+        EXECUTE format('ALTER TABLE %I ENABLE ROW LEVEL SECURITY', parent || '_default');
+    END IF;
+
+    -- Partitions created before RLS was enabled here (or by hand)
+    FOR child IN
+        SELECT c.relname
+        FROM pg_inherits i
+        JOIN pg_class c ON c.oid = i.inhrelid
+        WHERE i.inhparent = to_regclass(parent) AND NOT c.relrowsecurity
+    LOOP
+        EXECUTE format('ALTER TABLE %I ENABLE ROW LEVEL SECURITY', child.relname);
+    END LOOP;
+
+    RETURN created;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Detach monthly partitions that ended more than `keep_months` months ago.
+-- Empty ones (already rolled up by run_retention_batch) are dropped; others
+-- stay behind as standalone archive tables.
+CREATE OR REPLACE FUNCTION detach_old_partitions(parent TEXT, keep_months INT) RETURNS INT AS $$
+DECLARE
+    cutoff TIMESTAMPTZ := date_trunc('month', NOW()) - make_interval(months => keep_months);
+    child RECORD;
+    has_rows BOOLEAN;
+    detached INT := 0;
+BEGIN
+    FOR child IN
+        SELECT c.relname
+        FROM pg_inherits i
+        JOIN pg_class c ON c.oid = i.inhrelid
+        WHERE i.inhparent = to_regclass(parent)
+          AND c.relname ~ ('^' || parent || '_p[0-9]{6}$')
+    LOOP
+        IF to_timestamp(right(child.relname, 6), 'YYYYMM') + INTERVAL '1 month' <= cutoff THEN
+            EXECUTE format('ALTER TABLE %I DETACH PARTITION %I', parent, child.relname);
+            EXECUTE format('SELECT EXISTS (SELECT 1 FROM %I)', child.relname) INTO has_rows;
+            IF NOT has_rows THEN
+                EXECUTE format('DROP TABLE %I', child.relname);
+            END IF;
+            detached := detached + 1;
+        END IF;
+    END LOOP;
+    RETURN detached;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION maintain_time_partitions(
+    months_ahead INT DEFAULT 3,
+    activity_keep_months INT DEFAULT 2,
+    history_keep_months INT DEFAULT 12
+) RETURNS JSONB AS $$
+BEGIN
+    RETURN jsonb_build_object(
+        'activity_log_created', ensure_time_partitions('activity_log', months_ahead),
+        'agent_status_history_created', ensure_time_partitions('agent_status_history', months_ahead),
+        'activity_log_detached', detach_old_partitions('activity_log', activity_keep_months),
+        'agent_status_history_detached', detach_old_partitions('agent_status_history', history_keep_months)
+    );
+END;
+$$ LANGUAGE plpgsql;
+
+SELECT ensure_time_partitions('activity_log');
+SELECT ensure_time_partitions('agent_status_history');
+
+-- Keep the first-seen started_at when an upsert updates an existing agent
+CREATE OR REPLACE FUNCTION keep_agent_started_at() RETURNS TRIGGER AS $$
+BEGIN
+    NEW.started_at := COALESCE(OLD.started_at, NEW.started_at);
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS trg_agent_status_keep_started_at ON agent_status;
+CREATE TRIGGER trg_agent_status_keep_started_at
+    BEFORE UPDATE ON agent_status
+    FOR EACH ROW EXECUTE FUNCTION keep_agent_started_at();
+
+-- Stamp updated_at with the server clock, so the dashboard's delta fetch
+-- (updated_at > last seen) can't miss rows written late, e.g. from the outbox
+CREATE OR REPLACE FUNCTION touch_updated_at() RETURNS TRIGGER AS $$
+BEGIN
+    NEW.updated_at := NOW();
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS trg_agent_status_touch_updated_at ON agent_status;
+CREATE TRIGGER trg_agent_status_touch_updated_at
+    BEFORE INSERT OR UPDATE ON agent_status
+    FOR EACH ROW EXECUTE FUNCTION touch_updated_at();
+
+DROP TRIGGER IF EXISTS trg_cron_jobs_touch_updated_at ON cron_jobs;
+CREATE TRIGGER trg_cron_jobs_touch_updated_at
+    BEFORE INSERT OR UPDATE ON cron_jobs
+    FOR EACH ROW EXECUTE FUNCTION touch_updated_at();
+
+-- ======== Realtime ========
+-- Publish row changes for the dashboard's realtime mode (DASHBOARD_REALTIME=1).
+-- Partitioned activity_log is published under its own name, not per partition.
+DO $$
+DECLARE
+    t TEXT;
+BEGIN
+    IF NOT EXISTS (SELECT 1 FROM pg_publication WHERE pubname = 'supabase_realtime') THEN
+        RAISE NOTICE 'publication supabase_realtime not found, skipping (not a Supabase database?)';
+        RETURN;
+    END IF;
+    ALTER PUBLICATION supabase_realtime SET (publish_via_partition_root = true);
+    FOREACH t IN ARRAY ARRAY['agent_status', 'cron_jobs', 'activity_log'] LOOP
+        IF NOT EXISTS (
+            SELECT 1 FROM pg_publication_tables
+            WHERE pubname = 'supabase_realtime' AND schemaname = 'public' AND tablename = t
+        ) THEN
+            EXECUTE format('ALTER PUBLICATION supabase_realtime ADD TABLE %I', t);
+        END IF;
+    END LOOP;
+END $$;
+
+-- ======== Retention & Rollups ========
+-- Old activity_log / system_metrics rows are folded into hourly aggregates,
+-- and old hourly aggregates into daily ones. Run via `python maintenance.py`.
+
+CREATE TABLE IF NOT EXISTS activity_log_hourly (
+    bucket TIMESTAMPTZ NOT NULL,
+    agent_name TEXT NOT NULL DEFAULT '',
+    activity_type TEXT NOT NULL,
+    event_count BIGINT NOT NULL DEFAULT 0,
+    first_recorded_at TIMESTAMPTZ,
+    last_recorded_at TIMESTAMPTZ,
+    PRIMARY KEY (bucket, agent_name, activity_type)
+);
+
+CREATE TABLE IF NOT EXISTS activity_log_daily (LIKE activity_log_hourly INCLUDING ALL);
+
+CREATE TABLE IF NOT EXISTS system_metrics_hourly (
+    bucket TIMESTAMPTZ NOT NULL,
+    metric_name TEXT NOT NULL,
+    samples BIGINT NOT NULL DEFAULT 0,
+    numeric_samples BIGINT NOT NULL DEFAULT 0,
+    value_sum DOUBLE PRECISION,
+    value_min DOUBLE PRECISION,
+    value_max DOUBLE PRECISION,
+    PRIMARY KEY (bucket, metric_name)
+);
+
+CREATE TABLE IF NOT EXISTS system_metrics_daily (LIKE system_metrics_hourly INCLUDING ALL);
+
+ALTER TABLE activity_log_hourly ENABLE ROW LEVEL SECURITY;
+ALTER TABLE activity_log_daily ENABLE ROW LEVEL SECURITY;
+ALTER TABLE system_metrics_hourly ENABLE ROW LEVEL SECURITY;
+ALTER TABLE system_metrics_daily ENABLE ROW LEVEL SECURITY;
+
+-- One bounded batch of every rollup step. Each step deletes its source rows
+-- and adds them to the coarser table in the same statement, so a row is
+-- counted exactly once even if a run is interrupted. SKIP LOCKED keeps it from
+-- waiting on the sync daemon. Call repeatedly until every count is 0.
+CREATE OR REPLACE FUNCTION run_retention_batch(
+    raw_age INTERVAL DEFAULT '30 days',
+    hourly_age INTERVAL DEFAULT '180 days',
+    batch_size INT DEFAULT 5000
+) RETURNS JSONB AS $$
+DECLARE
+    activity_rows INT;
+    metric_rows INT;
+    activity_hours INT;
+    metric_hours INT;
+BEGIN
+    WITH batch AS (
+        DELETE FROM activity_log WHERE (id, recorded_at) IN (
+            SELECT id, recorded_at FROM activity_log
+            WHERE recorded_at < NOW() - raw_age
+            ORDER BY recorded_at
+            LIMIT batch_size
+            FOR UPDATE SKIP LOCKED
+        )
+        RETURNING agent_name, activity_type, recorded_at
+    ), rolled AS (
+        INSERT INTO activity_log_hourly AS h (bucket, agent_name, activity_type, event_count, first_recorded_at, last_recorded_at)
+        SELECT date_trunc('hour', recorded_at), COALESCE(agent_name, ''), activity_type, COUNT(*), MIN(recorded_at), MAX(recorded_at)
+        FROM batch
+        GROUP BY 1, 2, 3
+        ON CONFLICT (bucket, agent_name, activity_type) DO UPDATE SET
+            event_count = h.event_count + EXCLUDED.event_count,
+            first_recorded_at = LEAST(h.first_recorded_at, EXCLUDED.first_recorded_at),
+            last_recorded_at = GREATEST(h.last_recorded_at, EXCLUDED.last_recorded_at)
+    )
+    SELECT COUNT(*) INTO activity_rows FROM batch;
+
+    WITH batch AS (
+        DELETE FROM system_metrics WHERE id IN (
+            SELECT id FROM system_metrics
+            WHERE recorded_at < NOW() - raw_age
+            ORDER BY recorded_at
+            LIMIT batch_size
+            FOR UPDATE SKIP LOCKED
+        )
+        RETURNING metric_name, recorded_at,
+            CASE WHEN jsonb_typeof(metric_value) = 'number' THEN (metric_value #>> '{}')::DOUBLE PRECISION END AS value
+    ), rolled AS (
+        INSERT INTO system_metrics_hourly AS h (bucket, metric_name, samples, numeric_samples, value_sum, value_min, value_max)
+        SELECT date_trunc('hour', recorded_at), metric_name, COUNT(*), COUNT(value), SUM(value), MIN(value), MAX(value)
+        FROM batch
+        GROUP BY 1, 2
+        ON CONFLICT (bucket, metric_name) DO UPDATE SET
+            samples = h.samples + EXCLUDED.samples,
+            numeric_samples = h.numeric_samples + EXCLUDED.numeric_samples,
+            value_sum = COALESCE(h.value_sum, 0) + COALESCE(EXCLUDED.value_sum, 0),
+            value_min = LEAST(h.value_min, EXCLUDED.value_min),
+            value_max = GREATEST(h.value_max, EXCLUDED.value_max)
+    )
+    SELECT COUNT(*) INTO metric_rows FROM batch;
+
+    WITH batch AS (
+        DELETE FROM activity_log_hourly WHERE (bucket, agent_name, activity_type) IN (
+            SELECT bucket, agent_name, activity_type FROM activity_log_hourly
+            WHERE bucket < NOW() - hourly_age
+            ORDER BY bucket
+            LIMIT batch_size
+            FOR UPDATE SKIP LOCKED
+        )
+        RETURNING *
+    ), rolled AS (
+        INSERT INTO activity_log_daily AS d (bucket, agent_name, activity_type, event_count, first_recorded_at, last_recorded_at)
+        SELECT date_trunc('day', bucket), agent_name, activity_type, SUM(event_count), MIN(first_recorded_at), MAX(last_recorded_at)
+        FROM batch
+        GROUP BY 1, 2, 3
+        ON CONFLICT (bucket, agent_name, activity_type) DO UPDATE SET
+            event_count = d.event_count + EXCLUDED.event_count,
+            first_recorded_at = LEAST(d.first_recorded_at, EXCLUDED.first_recorded_at),
+            last_recorded_at = GREATEST(d.last_recorded_at, EXCLUDED.last_recorded_at)
+    )
+    SELECT COUNT(*) INTO activity_hours FROM batch;
+
+    WITH batch AS (
+        DELETE FROM system_metrics_hourly WHERE (bucket, metric_name) IN (
+            SELECT bucket, metric_name FROM system_metrics_hourly
+            WHERE bucket < NOW() - hourly_age
+            ORDER BY bucket
+            LIMIT batch_size
+            FOR UPDATE SKIP LOCKED
+        )
+        RETURNING *
+    ), rolled AS (
+        INSERT INTO system_metrics_daily AS d (bucket, metric_name, samples, numeric_samples, value_sum, value_min, value_max)
+        SELECT date_trunc('day', bucket), metric_name, SUM(samples), SUM(numeric_samples), SUM(value_sum), MIN(value_min), MAX(value_max)
+        FROM batch
+        GROUP BY 1, 2
+        ON CONFLICT (bucket, metric_name) DO UPDATE SET
+            samples = d.samples + EXCLUDED.samples,
+            numeric_samples = d.numeric_samples + EXCLUDED.numeric_samples,
+            value_sum = COALESCE(d.value_sum, 0) + COALESCE(EXCLUDED.value_sum, 0),
+            value_min = LEAST(d.value_min, EXCLUDED.value_min),
+            value_max = GREATEST(d.value_max, EXCLUDED.value_max)
+    )
+    SELECT COUNT(*) INTO metric_hours FROM batch;
+
+    RETURN jsonb_build_object(
+        'activity_log', activity_rows,
+        'system_metrics', metric_rows,
+        'activity_log_hourly', activity_hours,
+        'system_metrics_hourly', metric_hours
+    );
+END;
+$$ LANGUAGE plpgsql;
+
+-- ======== Status History Queries ========
+-- Transitions inside [window_start, window_end) plus each agent's last
+-- transition before the window (stamped at window_start), so a timeline can be
+-- rebuilt from its opening state. `lookback` bounds how many partitions the
+-- opening-state search may touch. Used by status_history.py.
+CREATE OR REPLACE FUNCTION agent_status_transitions(
+    window_start TIMESTAMPTZ,
+    window_end TIMESTAMPTZ DEFAULT NOW(),
+    lookback INTERVAL DEFAULT '30 days'
+) RETURNS TABLE (agent_name TEXT, from_status TEXT, to_status TEXT, task_name TEXT, recorded_at TIMESTAMPTZ) AS $$
+    SELECT * FROM (
+        SELECT DISTINCT ON (h.agent_name) h.agent_name, h.from_status, h.to_status, h.task_name, window_start
+        FROM agent_status_history h
+        WHERE h.recorded_at < window_start AND h.recorded_at >= window_start - lookback
+        ORDER BY h.agent_name, h.recorded_at DESC
+    ) opening
+    UNION ALL
+    SELECT h.agent_name, h.from_status, h.to_status, h.task_name, h.recorded_at
+    FROM agent_status_history h
+    WHERE h.recorded_at >= window_start AND h.recorded_at < window_end
+    ORDER BY 1, 5;
+$$ LANGUAGE sql STABLE;
+
+-- ======== Dashboard Counters ========
+-- One row with every sidebar counter, so the dashboard doesn't download whole
+-- tables to count them. Cron status follows app_new.py: disabled -> stopped,
+-- ok -> pending/running by next_run_at, error -> failed, never run -> pending.
+-- security_invoker keeps the tables' RLS in force for whoever reads the view.
+CREATE OR REPLACE VIEW dashboard_counters WITH (security_invoker = true) AS
+SELECT
+    a.total_agents, a.active_count, a.idle_count, a.busy_count,
+    c.total_crons, c.running_crons, c.enabled_crons, c.pending_crons, c.failed_crons
+FROM (
+    SELECT
+        COUNT(*) AS total_agents,
+        COUNT(*) FILTER (WHERE status IN ('working', 'active')) AS active_count,
+        COUNT(*) FILTER (WHERE status = 'idle') AS idle_count,
+        COUNT(*) FILTER (WHERE status IN ('failed', 'busy')) AS busy_count
+    FROM agent_status
+) a
+CROSS JOIN (
+    SELECT
+        COUNT(*) AS total_crons,
+        COUNT(*) FILTER (WHERE enabled AND last_status = 'ok' AND (next_run_at IS NULL OR next_run_at <= NOW())) AS running_crons,
+        COUNT(*) FILTER (WHERE enabled) AS enabled_crons,
+        COUNT(*) FILTER (WHERE enabled AND (
+            (last_status = 'ok' AND next_run_at > NOW())
+            OR last_status IS NULL OR last_status NOT IN ('ok', 'error')
+        )) AS pending_crons,
+        COUNT(*) FILTER (WHERE enabled AND last_status = 'error') AS failed_crons
+    FROM cron_jobs
+) c;
 
 -- Insert sample data (optional)
 -- INSERT INTO agent_status (agent_name, status, task_name, details) 
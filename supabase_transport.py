@@ -0,0 +1,200 @@
+"""
+🍃 Supabase REST Transport
+Keep-alive connection pool for the PostgREST API with bounded concurrency,
+optional gzip request bodies and jittered retries on 429/5xx
+"""
+
+import gzip
+import http.client
+import json
+import queue
+import random
+import threading
+import time
+import urllib.parse
+from concurrent.futures import ThreadPoolExecutor
+
+# ======== Configuration ========
+DEFAULT_POOL_SIZE = 4        # max connections == max requests in flight
+DEFAULT_TIMEOUT = 10         # seconds per request
+DEFAULT_MAX_RETRIES = 4
+BACKOFF_BASE = 0.5           # seconds, doubled per attempt
+BACKOFF_CAP = 8.0            # seconds
+GZIP_MIN_BYTES = 1024        # don't bother compressing tiny bodies
+
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+UNPROCESSED_STATUSES = {429, 503}  # rejected before the write ran, so safe to resend a plain POST
+CONNECTION_ERRORS = (http.client.HTTPException, ConnectionError, TimeoutError, OSError)
+STALE_ERRORS = (BrokenPipeError, ConnectionResetError)  # incl. RemoteDisconnected: a reused socket the server closed
+
+class TransportError(Exception):
+    """Request failed after all retries"""
+
+    def __init__(self, message, status=None, body=b""):
+        super().__init__(message)
+        self.status = status
+        self.body = body
+
+class SupabaseTransport:
+    """Thread-safe pool of persistent HTTP(S) connections to one Supabase project"""
+
+    def __init__(self, base_url, api_key, pool_size=DEFAULT_POOL_SIZE, timeout=DEFAULT_TIMEOUT,
+                 max_retries=DEFAULT_MAX_RETRIES, gzip_requests=False):
+        parsed = urllib.parse.urlsplit(base_url)
+        self.scheme = parsed.scheme or "https"
+        self.host = parsed.hostname
+        self.port = parsed.port
+        self.base_path = parsed.path.rstrip("/")
+        self.api_key = api_key
+        self.pool_size = pool_size
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.gzip_requests = gzip_requests
+        self._idle = queue.LifoQueue()
+        self._slots = threading.BoundedSemaphore(pool_size)
+        self.stats = {"requests": 0, "retries": 0, "connections": 0, "bytes_sent": 0}
+        self._stats_lock = threading.Lock()
+
+    def _count(self, name, amount=1):
+        with self._stats_lock:
+            self.stats[name] += amount
+
+    # ======== Connection Pool ========
+    def _new_connection(self):
+        self._count("connections")
+        if self.scheme == "http":
+            return http.client.HTTPConnection(self.host, self.port, timeout=self.timeout)
+        return http.client.HTTPSConnection(self.host, self.port, timeout=self.timeout)
+
+    def _acquire(self, fresh=False):
+        self._slots.acquire()
+        if fresh:
+            return self._new_connection()
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            return self._new_connection()
+
+    def _release(self, conn, reusable):
+        if reusable:
+            self._idle.put(conn)
+        else:
+            conn.close()
+        self._slots.release()
+
+    def close(self):
+        """Close every idle connection"""
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                break
+
+    # ======== Requests ========
+    def _headers(self, extra):
+        headers = {
+            "apikey": self.api_key,
+            "Authorization": f"Bearer {self.api_key}",
+            "Content-Type": "application/json",
+            "Accept-Encoding": "gzip",
+            "Connection": "keep-alive",
+        }
+        headers.update(extra or {})
+        return headers
+
+    def _encode_body(self, body, headers):
+        if body is None:
+            return None
+        data = body if isinstance(body, bytes) else json.dumps(body).encode('utf-8')
+        if self.gzip_requests and len(data) >= GZIP_MIN_BYTES:
+            data = gzip.compress(data)
+            headers["Content-Encoding"] = "gzip"
+        return data
+
+    def _backoff(self, attempt, retry_after=None):
+        if retry_after:
+            try:
+                return min(float(retry_after), BACKOFF_CAP)
+            except ValueError:
+                pass
+        # Full jitter: spreads retries from concurrent workers apart
+        return random.uniform(0, min(BACKOFF_CAP, BACKOFF_BASE * 2 ** attempt))
+
+    def request(self, method, path, body=None, params=None, headers=None):
+        """
+        Send one request, retrying 429/5xx and dropped connections.
+        A POST that isn't an upsert may already have been applied once the
+        request is sent, so it is only retried on UNPROCESSED_STATUSES or
+        when it failed before the request was fully sent. Any request on a
+        pooled connection the server had already closed gets one immediate
+        retry on a fresh connection: nothing was answered, so nothing ran.
+        Returns (status, response body bytes); raises TransportError.
+        """
+        url = f"{self.base_path}{path}"
+        if params:
+            url += "?" + urllib.parse.urlencode(params)
+        headers = self._headers(headers)
+        data = self._encode_body(body, headers)
+        idempotent = method != "POST" or "resolution=" in headers.get("Prefer", "")
+        retry_statuses = RETRY_STATUSES if idempotent else UNPROCESSED_STATUSES
+        stale_retried = False
+        attempt = 0
+
+        while True:
+            conn = self._acquire(fresh=stale_retried)
+            reused = conn.sock is not None
+            reusable = False
+            retry_after = None
+            sent = answered = False
+            stale = False
+            try:
+                conn.request(method, url, body=data, headers=headers)
+                sent = True
+                response = conn.getresponse()
+                answered = True
+                payload = response.read()
+                if response.getheader("Content-Encoding") == "gzip":
+                    payload = gzip.decompress(payload)
+                reusable = not response.will_close
+                self._count("requests")
+                self._count("bytes_sent", len(data or b""))
+
+                if response.status < 400:
+                    return response.status, payload
+                if response.status not in retry_statuses or attempt == self.max_retries:
+                    raise TransportError(f"{method} {path} -> HTTP {response.status}", response.status, payload)
+                retry_after = response.getheader("Retry-After")
+            except TransportError:
+                raise
+            except CONNECTION_ERRORS as e:
+                stale = reused and not answered and not stale_retried and isinstance(e, STALE_ERRORS)
+                if not stale and (attempt == self.max_retries or (sent and not idempotent)):
+                    raise TransportError(f"{method} {path} failed: {e}") from e
+            finally:
+                self._release(conn, reusable)
+
+            self._count("retries")
+            if stale:
+                stale_retried = True  # doesn't use up an attempt
+                continue
+            time.sleep(self._backoff(attempt, retry_after))
+            attempt += 1
+
+    def insert(self, table, rows, prefer="return=minimal", on_conflict=None):
+        """POST one row or a list of rows into a table"""
+        headers = {"Prefer": prefer}
+        params = {"on_conflict": on_conflict} if on_conflict else None
+        return self.request("POST", f"/rest/v1/{table}", body=rows, params=params, headers=headers)
+
+    def insert_each(self, table, rows, **kwargs):
+        """Insert rows one request each, up to pool_size in flight; returns per-row success"""
+        def send(row):
+            try:
+                self.insert(table, row, **kwargs)
+                return True
+            except TransportError as e:
+                print(f"⚠️  Supabase error: {e}")
+                return False
+
+        with ThreadPoolExecutor(max_workers=self.pool_size) as executor:
+            return list(executor.map(send, rows))
@@ -4,14 +4,24 @@
 Syncs OpenClaw session and cron data to Supabase every 30 seconds
 """
 
+import asyncio
 import json
 import time
 import os
-import glob
+from dataclasses import dataclass
+from typing import Optional
 from pathlib import Path
 from datetime import datetime
 from supabase import create_client, Client
 from dotenv import load_dotenv
+from session_scanner import SessionScanner
+from session_watcher import create_watcher, wait_for_changes
+from change_cache import ChangeCache
+from sync_engine import AsyncSyncEngine, unique_rows
+from sync_outbox import SyncOutbox
+from activity_pipeline import ActivityPipeline
+from status_history import StatusTransitionTracker
+from office_records import agent_records, cron_records
 
 # Load environment variables
 load_dotenv()
@@ -21,7 +31,18 @@ SUPABASE_URL = os.getenv("SUPABASE_URL", "")
 SUPABASE_KEY = os.getenv("SUPABASE_KEY", "")
 OPENCLAW_SESSIONS_DIR = Path("/home/node/.openclaw/agents/main/sessions")
 OPENCLAW_CRON_DIR = Path("/home/node/.openclaw/cron")
-SYNC_INTERVAL = 30  # seconds
+SYNC_INTERVAL = int(os.getenv("SYNC_INTERVAL", "30"))  # seconds
+SYNC_MODE = os.getenv("SYNC_MODE", "poll")  # "poll" or "watch" (inotify, sub-second)
+SYNC_WRITE_MODE = os.getenv("SYNC_WRITE_MODE", "upsert")  # "upsert" (batched) or "row" (select + update/insert)
+UPSERT_CHUNK_SIZE = int(os.getenv("UPSERT_CHUNK_SIZE", "500"))  # rows per upsert request
+SYNC_ENGINE = os.getenv("SYNC_ENGINE", "sequential")  # "sequential" or "async" (poll mode, concurrent writes)
+SYNC_MAX_IN_FLIGHT = int(os.getenv("SYNC_MAX_IN_FLIGHT", "8"))  # concurrent Supabase requests for the async engine
+SYNC_OUTBOX = os.getenv("SYNC_OUTBOX", "1") == "1"  # queue writes in a local SQLite outbox before sending
+OUTBOX_MAX_MB = int(os.getenv("OUTBOX_MAX_MB", "64"))  # oldest pending rows are dropped beyond this
+ACTIVITY_SUMMARY_MINUTES = int(os.getenv("ACTIVITY_SUMMARY_MINUTES", "15"))  # one sync_summary row per interval
+ACTIVITY_FLUSH_SECONDS = int(os.getenv("ACTIVITY_FLUSH_SECONDS", "60"))  # max time activity waits in memory
+CHANGE_HEARTBEAT = int(os.getenv("CHANGE_HEARTBEAT", "0"))  # seconds; rewrite unchanged rows this often (0 = never)
+SYNC_STATE_DIR = Path(os.getenv("SYNC_STATE_DIR", Path(__file__).parent / ".sync_state"))
 
 # ======== Supabase Client ========
 def get_supabase_client() -> Client:
@@ -32,36 +53,6 @@ def get_supabase_client() -> Client:
     return create_client(SUPABASE_URL, SUPABASE_KEY)
 
 # ======== Read OpenClaw Data ========
-def read_sessions_data():
-    """Read OpenClaw sessions from .jsonl files"""
-    sessions = {}
-    
-    if not OPENCLAW_SESSIONS_DIR.exists():
-        return {}
-    
-    # Find all active session files
-    for f in OPENCLAW_SESSIONS_DIR.glob("*.jsonl"):
-        if ".deleted." in f.name or ".lock" in f.name:
-            continue
-        
-        try:
-            # Read last line for current state
-            with open(f, 'r') as file:
-                lines = file.readlines()
-                if lines:
-                    last_line = json.loads(lines[-1])
-                    # Extract session info from last message
-                    session_id = f.stem
-                    sessions[session_id] = {
-                        "sessionId": session_id,
-                        "updatedAt": last_line.get("timestamp", 0) * 1000 if "timestamp" in last_line else datetime.now().timestamp() * 1000,
-                        "currentTask": last_line.get("content", "")[:100] if "content" in last_line else "Active session",
-                    }
-        except Exception as e:
-            print(f"⚠️  Error reading {f.name}: {e}")
-    
-    return sessions
-
 def read_cron_jobs():
     """Read OpenClaw cron jobs"""
     jobs_file = OPENCLAW_CRON_DIR / "jobs.json"
@@ -76,31 +67,16 @@ def process_agent_status(sessions_data):
     """Process session data to extract agent statuses"""
     agents = []
     
-    for session_id, session_info in sessions_data.items():
-        # Determine status based on session activity
-        updated_at = session_info.get("updatedAt", 0)
-        current_time = datetime.now().timestamp() * 1000
-        time_diff = current_time - updated_at
-        
-        # Active within last 5 minutes = working
-        if time_diff < 5 * 60 * 1000:
-            status = "working"
-        elif time_diff < 30 * 60 * 1000:
-            status = "idle"
-        else:
-            status = "completed"
-        
-        # Extract task info
-        task_name = session_info.get("currentTask", "Active session")
-        
+    for record in agent_records(sessions_data):
+        updated_at = record.updated_at_ms
         agents.append({
-            "agent_name": session_id[:50],  # Limit length
-            "status": status,
-            "task_name": task_name,
+            "agent_name": record.session_key[:50],  # Limit length
+            "status": record.status,
+            "task_name": record.task_name,
             "started_at": datetime.fromtimestamp(updated_at / 1000).isoformat() if updated_at else datetime.now().isoformat(),
             "updated_at": datetime.now().isoformat(),
             "details": json.dumps({
-                "session_id": session_id,
+                "session_id": record.session_key,
             })
         })
     
@@ -110,52 +86,62 @@ def process_cron_jobs(jobs_data):
     """Process cron jobs data"""
     jobs = []
     
-    for job in jobs_data.get("jobs", []):
-        state = job.get("state", {})
-        schedule = job.get("schedule", {})
-        
-        # Determine status
-        if not job.get("enabled", True):
-            status = "stopped"
-        elif state.get("lastStatus") == "ok":
-            next_run = state.get("nextRunAtMs", 0)
-            current_time = datetime.now().timestamp() * 1000
-            if next_run > current_time:
-                status = "pending"
-            else:
-                status = "running"
-        else:
-            status = "failed"
-        
+    for record in cron_records(jobs_data):
         jobs.append({
-            "job_id": job.get("id", ""),
-            "name": job.get("name", ""),
-            "enabled": job.get("enabled", True),
-            "schedule_expr": schedule.get("expr", ""),
-            "timezone": schedule.get("tz", ""),
-            "session_target": job.get("sessionTarget", ""),
-            "wake_mode": job.get("wakeMode", ""),
-            "payload_message": job.get("payload", {}).get("message", "")[:500],
-            "model": job.get("payload", {}).get("model", ""),
-            "delivery_mode": job.get("delivery", {}).get("mode", ""),
-            "delivery_channel": job.get("delivery", {}).get("channel", ""),
-            "delivery_target": job.get("delivery", {}).get("to", ""),
-            "last_run_at": datetime.fromtimestamp(state.get("lastRunAtMs", 0) / 1000).isoformat() if state.get("lastRunAtMs") else None,
-            "last_status": state.get("lastStatus", ""),
-            "last_duration_ms": state.get("lastDurationMs", 0),
-            "consecutive_errors": state.get("consecutiveErrors", 0),
-            "next_run_at": datetime.fromtimestamp(state.get("nextRunAtMs", 0) / 1000).isoformat() if state.get("nextRunAtMs") else None,
+            "job_id": record.job_id,
+            "name": record.name,
+            "enabled": record.enabled,
+            "schedule_expr": record.schedule_expr,
+            "timezone": record.timezone,
+            "session_target": record.session_target,
+            "wake_mode": record.wake_mode,
+            "payload_message": record.payload_message,
+            "model": record.model,
+            "delivery_mode": record.delivery_mode,
+            "delivery_channel": record.delivery_channel,
+            "delivery_target": record.delivery_target,
+            "last_run_at": datetime.fromtimestamp(record.last_run_ms / 1000).isoformat() if record.last_run_ms else None,
+            "last_status": record.last_status,
+            "last_duration_ms": record.last_duration_ms,
+            "consecutive_errors": record.consecutive_errors,
+            "next_run_at": datetime.fromtimestamp(record.next_run_ms / 1000).isoformat() if record.next_run_ms else None,
             "updated_at": datetime.now().isoformat()
         })
     
     return jobs
 
 # ======== Sync to Supabase ========
+def upsert_rows(supabase: Client, table: str, rows, on_conflict: str, chunk_size: int = UPSERT_CHUNK_SIZE):
+    """
+    Upsert rows in chunked multi-row requests, resolving conflicts on
+    `on_conflict`. Returns (rows written, payload bytes sent).
+    """
+    rows = unique_rows(rows, on_conflict)
+    total_bytes = 0
+    synced = []
+    
+    for start in range(0, len(rows), chunk_size):
+        chunk = rows[start:start + chunk_size]
+        payload_bytes = len(json.dumps(chunk).encode('utf-8'))
+        try:
+            supabase.table(table).upsert(chunk, on_conflict=on_conflict).execute()
+            synced.extend(chunk)
+            total_bytes += payload_bytes
+            print(f"✅ Upserted {len(chunk)} rows into {table} ({payload_bytes} bytes)")
+        except Exception as e:
+            print(f"❌ Error upserting {len(chunk)} rows into {table}: {e}")
+    
+    return synced, total_bytes
+
 def sync_agent_status(supabase: Client, agents):
-    """Sync agent statuses to Supabase"""
+    """Sync agent statuses to Supabase, returning the rows written"""
     if not supabase:
-        return
+        return []
+    
+    if SYNC_WRITE_MODE == "upsert":
+        return upsert_rows(supabase, "agent_status", agents, "agent_name")[0]
     
+    synced = []
     for agent in agents:
         try:
             existing = supabase.table("agent_status").select("id").eq("agent_name", agent["agent_name"]).execute()
@@ -177,15 +163,22 @@ def sync_agent_status(supabase: Client, agents):
                     "details": agent["details"]
                 }).execute()
             
+            synced.append(agent)
             print(f"✅ Synced agent: {agent['agent_name'][:30]} - {agent['status']}")
         except Exception as e:
             print(f"❌ Error syncing agent: {e}")
+    
+    return synced
 
 def sync_cron_jobs(supabase: Client, jobs):
-    """Sync cron jobs to Supabase"""
+    """Sync cron jobs to Supabase, returning the rows written"""
     if not supabase:
-        return
+        return []
+    
+    if SYNC_WRITE_MODE == "upsert":
+        return upsert_rows(supabase, "cron_jobs", jobs, "job_id")[0]
     
+    synced = []
     for job in jobs:
         try:
             existing = supabase.table("cron_jobs").select("id").eq("job_id", job["job_id"]).execute()
@@ -195,22 +188,30 @@ def sync_cron_jobs(supabase: Client, jobs):
             else:
                 supabase.table("cron_jobs").insert(job).execute()
             
+            synced.append(job)
             print(f"✅ Synced job: {job['name']} - {job.get('last_status', 'unknown')}")
         except Exception as e:
             print(f"❌ Error syncing job: {e}")
+    
+    return synced
 
-def log_activity(supabase: Client, activity_type: str, description: str, agent_name: str = ""):
-    """Log activity to Supabase"""
-    if not supabase:
+def log_status_history(supabase: Client, rows):
+    """Insert a batch of agent_status_history transition rows"""
+    if not supabase or not rows:
         return
     
     try:
-        supabase.table("activity_log").insert({
-            "agent_name": agent_name,
-            "activity_type": activity_type,
-            "description": description,
-            "recorded_at": datetime.now().isoformat()
-        }).execute()
+        supabase.table("agent_status_history").insert(rows).execute()
+    except Exception as e:
+        print(f"⚠️  Status history error: {e}")
+
+def log_activities(supabase: Client, rows):
+    """Insert a batch of activity_log rows"""
+    if not supabase or not rows:
+        return
+    
+    try:
+        supabase.table("activity_log").insert(rows).execute()
     except Exception as e:
         print(f"⚠️  Activity log error: {e}")
 
@@ -237,44 +238,356 @@ def print_demo_status(agents, jobs):
     print("\n" + "="*50 + "\n")
 
 # ======== Main Loop ========
-def main():
-    print("🍃 Starting OpenClaw Agent Status Sync Daemon...")
-    print(f"📁 Sessions: {OPENCLAW_SESSIONS_DIR}")
-    print(f"📁 Cron: {OPENCLAW_CRON_DIR}")
-    print(f"⏱️  Sync interval: {SYNC_INTERVAL} seconds")
+OUTBOX_CONFLICT_KEYS = {"agent_status": "agent_name", "cron_jobs": "job_id", "activity_log": None, "agent_status_history": None}
+# SQLSTATE classes for rows Postgres will never accept: data exceptions,
+# integrity constraints, undefined columns / syntax
+PERMANENT_SQLSTATE_CLASSES = ("22", "23", "42")
+
+@dataclass
+class SyncState:
+    """Everything a sync cycle reads from and writes through"""
+    scanner: SessionScanner
+    agent_cache: ChangeCache
+    job_cache: ChangeCache
+    activity: ActivityPipeline
+    history: StatusTransitionTracker
+    outbox: Optional[SyncOutbox] = None
+
+def create_sync_state(supabase):
+    """Scanner, change caches, activity buffer, status history and (with Supabase) the outbox"""
+    outbox = None
+    if supabase and SYNC_OUTBOX:
+        outbox = SyncOutbox(SYNC_STATE_DIR / "outbox.sqlite3", OUTBOX_MAX_MB * 1024 * 1024)
+    return SyncState(
+        scanner=SessionScanner(OPENCLAW_SESSIONS_DIR, SYNC_STATE_DIR / "sessions.json"),
+        agent_cache=ChangeCache(SYNC_STATE_DIR / "agent_hashes.json", "agent_name", CHANGE_HEARTBEAT),
+        job_cache=ChangeCache(SYNC_STATE_DIR / "cron_hashes.json", "job_id", CHANGE_HEARTBEAT),
+        activity=ActivityPipeline(ACTIVITY_SUMMARY_MINUTES * 60, ACTIVITY_FLUSH_SECONDS),
+        history=StatusTransitionTracker(SYNC_STATE_DIR / "agent_statuses.json"),
+        outbox=outbox,
+    )
+
+def plan_cycle(state, agents, jobs):
+    """Changed rows, agent status transitions and any activity rows that are due"""
+    changed_agents = state.agent_cache.changed(agents)
+    changed_jobs = state.job_cache.changed(jobs)
+    transitions = state.history.transitions(agents)
+    state.activity.observe(transitions, jobs)
+    return changed_agents, changed_jobs, transitions, state.activity.drain()
+
+def finish_cycle(state, agents, jobs, rows_changed, full_sync, started):
+    """Record the cycle, prune vanished keys on full syncs and persist caches"""
+    state.activity.record_sync((time.perf_counter() - started) * 1000, len(agents), len(jobs), rows_changed)
+    if full_sync:
+        state.agent_cache.prune(a["agent_name"] for a in agents)
+        state.job_cache.prune(j["job_id"] for j in jobs)
+        state.history.prune(a["agent_name"] for a in agents)
+    state.agent_cache.save()
+    state.job_cache.save()
+    state.history.save()
+
+def enqueue_changes(state, changed_agents, changed_jobs, transitions=(), activities=()):
+    """Hand changed rows to the outbox, which now owns their delivery"""
+    dropped = []
+    dropped += state.outbox.enqueue("agent_status", changed_agents, "agent_name")
+    dropped += state.outbox.enqueue("cron_jobs", changed_jobs, "job_id")
+    dropped += state.outbox.enqueue("agent_status_history", transitions)
+    dropped += state.outbox.enqueue("activity_log", activities)
+    state.agent_cache.commit(changed_agents)
+    state.job_cache.commit(changed_jobs)
+    # Rows the outbox cap dropped were never delivered: have the next cycle send them again
+    state.agent_cache.forget(key for table, key in dropped if table == "agent_status")
+    state.job_cache.forget(key for table, key in dropped if table == "cron_jobs")
+
+def is_permanent_error(error):
+    """
+    True when Supabase rejected the rows themselves (bad data, constraint,
+    unknown column), so sending them again can't succeed. Connection errors,
+    timeouts, 429 and 5xx are worth retrying.
+    """
+    code = str(getattr(error, "code", "") or "")
+    if len(code) == 3 and code.isdigit():
+        # An HTTP status: the error body wasn't PostgREST JSON
+        return 400 <= int(code) < 500 and int(code) not in (408, 429)
+    return code[:2] in PERMANENT_SQLSTATE_CLASSES and len(code) == 5 or code.startswith(("PGRST1", "PGRST2"))
+
+def send_outbox_rows(supabase: Client, table, rows):
+    on_conflict = OUTBOX_CONFLICT_KEYS.get(table)
+    if on_conflict:
+        supabase.table(table).upsert(rows, on_conflict=on_conflict).execute()
+    else:
+        supabase.table(table).insert(rows).execute()
+
+def drain_outbox(supabase: Client, outbox):
+    """
+    Ship pending outbox rows in acknowledged batches. A batch that fails
+    for a retryable reason waits for the next cycle; one Supabase rejects
+    is retried row by row and only the rejected rows are parked.
+    """
+    for table in outbox.tables():
+        while True:
+            batch = outbox.peek(table, UPSERT_CHUNK_SIZE)
+            if not batch:
+                break
+            try:
+                send_outbox_rows(supabase, table, [row for _, row in batch])
+            except Exception as e:
+                if not is_permanent_error(e) or not ship_row_by_row(supabase, outbox, table, batch):
+                    print(f"⚠️  Outbox: {table} batch failed, {outbox.pending(table)} rows kept for retry: {e}")
+                    break
+                continue
+            outbox.ack([row_id for row_id, _ in batch])
+            print(f"✅ Shipped {len(batch)} {table} rows from outbox")
+
+def ship_row_by_row(supabase: Client, outbox, table, batch):
+    """Send a rejected batch one row at a time, parking rows rejected for good; False on a retryable error"""
+    for row_id, row in batch:
+        try:
+            send_outbox_rows(supabase, table, [row])
+        except Exception as e:
+            if not is_permanent_error(e):
+                return False
+            outbox.park(row_id, e)
+            print(f"❌ Outbox: parked a {table} row Supabase rejected: {e} ({json.dumps(row, default=str)[:200]})")
+            continue
+        outbox.ack([row_id])
+    return True
+
+def sync_cycle(supabase, state, agents, jobs, full_sync=True):
+    """Write only changed rows plus due activity; on a full sync also prune vanished keys"""
+    if not supabase:
+        print_demo_status(agents, jobs)
+        return
     
-    supabase = get_supabase_client()
+    started = time.perf_counter()
+    changed_agents, changed_jobs, transitions, activities = plan_cycle(state, agents, jobs)
     
-    if supabase:
-        print("✅ Connected to Supabase!")
+    if state.outbox:
+        enqueue_changes(state, changed_agents, changed_jobs, transitions, activities)
+        drain_outbox(supabase, state.outbox)
     else:
-        print("⚠️  Running in demo mode (no Supabase)")
-    
-    print("\n🚀 Daemon started! Press Ctrl+C to stop.\n")
+        state.agent_cache.commit(sync_agent_status(supabase, changed_agents))
+        state.job_cache.commit(sync_cron_jobs(supabase, changed_jobs))
+        log_status_history(supabase, transitions)
+        log_activities(supabase, activities)
     
+    finish_cycle(state, agents, jobs, len(changed_agents) + len(changed_jobs), full_sync, started)
+
+def flush_activity(supabase, state):
+    """Write whatever activity is still buffered (on shutdown)"""
+    rows = state.activity.drain(force=True)
+    if state.outbox:
+        state.outbox.enqueue("activity_log", rows)
+    else:
+        log_activities(supabase, rows)
+
+def run_polling(supabase, state):
+    """Full scan + sync every SYNC_INTERVAL seconds"""
     while True:
         try:
-            sessions_data = read_sessions_data()
+            sessions_data, _ = state.scanner.scan()
+            state.scanner.save()
             cron_data = read_cron_jobs()
             
             agents = process_agent_status(sessions_data)
             jobs = process_cron_jobs(cron_data)
             
-            if supabase:
-                sync_agent_status(supabase, agents)
-                sync_cron_jobs(supabase, jobs)
-                log_activity(supabase, "sync", f"Synced {len(agents)} agents and {len(jobs)} cron jobs")
-            else:
-                print_demo_status(agents, jobs)
+            sync_cycle(supabase, state, agents, jobs)
             
             time.sleep(SYNC_INTERVAL)
             
         except KeyboardInterrupt:
-            print("\n\n🛑 Daemon stopped by user. Sayonara! 🌸")
-            break
+            raise
         except Exception as e:
             print(f"❌ Error in main loop: {e}")
             time.sleep(SYNC_INTERVAL)
 
+def changed_cron_jobs(cron_data, fingerprints):
+    """Keep only jobs whose definition/state differs from the last sync"""
+    changed = []
+    current = {}
+    for job in cron_data.get("jobs", []):
+        fingerprint = json.dumps(job, sort_keys=True)
+        current[job.get("id", "")] = fingerprint
+        if fingerprints.get(job.get("id", "")) != fingerprint:
+            changed.append(job)
+    fingerprints.clear()
+    fingerprints.update(current)
+    return {"jobs": changed}
+
+def run_watch(supabase, state):
+    """
+    Sync files as soon as they change (debounced), with a full scan every
+    SYNC_INTERVAL seconds to catch time-based status changes (working -> idle).
+    """
+    watcher = create_watcher([OPENCLAW_SESSIONS_DIR, OPENCLAW_CRON_DIR])
+    print(f"👀 Watching with {type(watcher).__name__}")
+    jobs_file = OPENCLAW_CRON_DIR / "jobs.json"
+    job_fingerprints = {}
+    next_full_sync = 0
+    
+    try:
+        while True:
+            try:
+                now = time.monotonic()
+                if now >= next_full_sync:
+                    sessions_data, _ = state.scanner.scan()
+                    cron_data = read_cron_jobs()
+                    changed_cron_jobs(cron_data, job_fingerprints)
+                    full_sync = True
+                    next_full_sync = now + SYNC_INTERVAL
+                else:
+                    changed = wait_for_changes(watcher, next_full_sync - now)
+                    if not changed:
+                        continue
+                    if OPENCLAW_SESSIONS_DIR in changed or OPENCLAW_CRON_DIR in changed:
+                        # Watcher lost events: resync everything
+                        next_full_sync = 0
+                        continue
+                    
+                    session_names = {p.name for p in changed if p.parent == OPENCLAW_SESSIONS_DIR}
+                    sessions_data = state.scanner.scan_files(session_names)
+                    cron_data = changed_cron_jobs(read_cron_jobs(), job_fingerprints) if jobs_file in changed else {"jobs": []}
+                    full_sync = False
+                state.scanner.save()
+                
+                agents = process_agent_status(sessions_data)
+                jobs = process_cron_jobs(cron_data)
+                if not full_sync and not agents and not jobs:
+                    continue
+                
+                sync_cycle(supabase, state, agents, jobs, full_sync)
+                
+            except KeyboardInterrupt:
+                raise
+            except Exception as e:
+                print(f"❌ Error in main loop: {e}")
+                time.sleep(1)
+    finally:
+        watcher.close()
+
+async def drain_outbox_async(engine, outbox):
+    """Drain every table's outbox rows concurrently through the engine (same rules as drain_outbox)"""
+    def send(table, rows):
+        return engine.call(table, lambda: send_outbox_rows(engine.supabase, table, rows), rows)
+    
+    async def ship_row_by_row(table, batch):
+        for row_id, row in batch:
+            error = await send(table, [row])
+            if error is None:
+                outbox.ack([row_id])
+            elif is_permanent_error(error):
+                outbox.park(row_id, error)
+                print(f"❌ Outbox: parked a {table} row Supabase rejected: {error} ({json.dumps(row, default=str)[:200]})")
+            else:
+                return False
+        return True
+    
+    async def drain_table(table):
+        while True:
+            batch = outbox.peek(table, UPSERT_CHUNK_SIZE)
+            if not batch:
+                break
+            error = await send(table, [row for _, row in batch])
+            if error is None:
+                outbox.ack([row_id for row_id, _ in batch])
+            elif not is_permanent_error(error) or not await ship_row_by_row(table, batch):
+                print(f"⚠️  Outbox: {outbox.pending(table)} {table} rows kept for retry")
+                break
+    
+    await asyncio.gather(*(drain_table(table) for table in outbox.tables()))
+
+async def sync_cycle_async(engine, state):
+    """One full cycle with reads and per-table writes running concurrently"""
+    started = time.perf_counter()
+    engine.reset_stats()
+    
+    (sessions_data, _), cron_data = await asyncio.gather(
+        asyncio.to_thread(state.scanner.scan),
+        asyncio.to_thread(read_cron_jobs),
+    )
+    state.scanner.save()
+    
+    agents = process_agent_status(sessions_data)
+    jobs = process_cron_jobs(cron_data)
+    changed_agents, changed_jobs, transitions, activities = plan_cycle(state, agents, jobs)
+    
+    if state.outbox:
+        enqueue_changes(state, changed_agents, changed_jobs, transitions, activities)
+        await drain_outbox_async(engine, state.outbox)
+    else:
+        writes = [
+            engine.upsert("agent_status", changed_agents, "agent_name", UPSERT_CHUNK_SIZE),
+            engine.upsert("cron_jobs", changed_jobs, "job_id", UPSERT_CHUNK_SIZE),
+        ]
+        if transitions:
+            writes.append(engine.insert("agent_status_history", transitions))
+        if activities:
+            writes.append(engine.insert("activity_log", activities))
+        synced_agents, synced_jobs, *_ = await asyncio.gather(*writes)
+        state.agent_cache.commit(synced_agents)
+        state.job_cache.commit(synced_jobs)
+    
+    finish_cycle(state, agents, jobs, len(changed_agents) + len(changed_jobs), True, started)
+    
+    wall = time.perf_counter() - started
+    stats = engine.stats
+    print(f"⏱️  Cycle {wall:.2f}s wall vs {stats['request_time']:.2f}s summed over {stats['requests']} requests ({stats['errors']} failed, {stats['bytes_sent']} bytes)")
+
+async def run_async(supabase, state):
+    """Polling loop on the async engine; Ctrl+C cancels in-flight work"""
+    engine = AsyncSyncEngine(supabase, SYNC_MAX_IN_FLIGHT)
+    engine.start()
+    try:
+        while True:
+            try:
+                await sync_cycle_async(engine, state)
+            except Exception as e:
+                print(f"❌ Error in main loop: {e}")
+            await asyncio.sleep(SYNC_INTERVAL)
+    finally:
+        await engine.close()
+
+def main():
+    if SYNC_ENGINE == "async" and SYNC_WRITE_MODE != "upsert":
+        # The async engine only batches upserts; fail now rather than silently ignore the setting
+        raise SystemExit(f"❌ SYNC_ENGINE=async needs SYNC_WRITE_MODE=upsert (got {SYNC_WRITE_MODE!r})")
+    if SYNC_OUTBOX and SYNC_WRITE_MODE != "upsert":
+        # So does the outbox drain (it resends rows, so it needs on_conflict)
+        raise SystemExit(f"❌ SYNC_WRITE_MODE={SYNC_WRITE_MODE!r} needs SYNC_OUTBOX=0: the outbox only upserts")
+    
+    print("🍃 Starting OpenClaw Agent Status Sync Daemon...")
+    print(f"📁 Sessions: {OPENCLAW_SESSIONS_DIR}")
+    print(f"📁 Cron: {OPENCLAW_CRON_DIR}")
+    print(f"⏱️  Sync interval: {SYNC_INTERVAL} seconds ({SYNC_MODE} mode)")
+    print(f"💾 State: {SYNC_STATE_DIR}")
+    
+    supabase = get_supabase_client()
+    state = create_sync_state(supabase)
+    
+    if supabase:
+        print("✅ Connected to Supabase!")
+        if state.outbox:
+            print(f"📮 Outbox: {state.outbox.pending()} rows pending from previous runs")
+    else:
+        print("⚠️  Running in demo mode (no Supabase)")
+    
+    print("\n🚀 Daemon started! Press Ctrl+C to stop.\n")
+    
+    try:
+        if SYNC_MODE == "watch":
+            run_watch(supabase, state)
+        elif SYNC_ENGINE == "async" and supabase:
+            asyncio.run(run_async(supabase, state))
+        else:
+            run_polling(supabase, state)
+    except KeyboardInterrupt:
+        print("\n\n🛑 Daemon stopped by user. Sayonara! 🌸")
+    finally:
+        if supabase:
+            flush_activity(supabase, state)
+        if state.outbox:
+            state.outbox.close()
+
 if __name__ == "__main__":
     main()
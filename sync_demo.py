@@ -6,61 +6,15 @@
 import json
 import os
 from pathlib import Path
-from datetime import datetime, timezone
+from session_reader import read_sessions_data as read_session_files
+from office_records import agent_records, cron_records
 
 OPENCLAW_SESSIONS_DIR = Path("/home/node/.openclaw/agents/main/sessions")
 OPENCLAW_CRON_DIR = Path("/home/node/.openclaw/cron")
 
-def parse_timestamp(ts):
-    """Parse various timestamp formats"""
-    if not ts:
-        return datetime.now(timezone.utc).timestamp() * 1000
-    
-    # If it's already a number
-    if isinstance(ts, (int, float)):
-        return ts
-    
-    # If it's a string, try to parse
-    if isinstance(ts, str):
-        try:
-            # Try ISO format
-            if 'T' in ts:
-                dt = datetime.fromisoformat(ts.replace('Z', '+00:00'))
-                return dt.timestamp() * 1000
-            # Try Unix timestamp string
-            return float(ts) * 1000
-        except:
-            return datetime.now(timezone.utc).timestamp() * 1000
-    
-    return datetime.now(timezone.utc).timestamp() * 1000
-
 def read_sessions_data():
     """Read OpenClaw sessions from .jsonl files"""
-    sessions = {}
-    
-    if not OPENCLAW_SESSIONS_DIR.exists():
-        return {}
-    
-    for f in OPENCLAW_SESSIONS_DIR.glob("*.jsonl"):
-        if ".deleted." in f.name or ".lock" in f.name:
-            continue
-        
-        try:
-            with open(f, 'r') as file:
-                lines = file.readlines()
-                if lines:
-                    last_line = json.loads(lines[-1])
-                    session_id = f.stem
-                    ts = parse_timestamp(last_line.get("timestamp"))
-                    sessions[session_id] = {
-                        "sessionId": session_id,
-                        "updatedAt": ts,
-                        "currentTask": last_line.get("content", "")[:100] if "content" in last_line else "Active session",
-                    }
-        except Exception as e:
-            print(f"⚠️  Error reading {f.name}: {e}")
-    
-    return sessions
+    return read_session_files(OPENCLAW_SESSIONS_DIR)
 
 def read_cron_jobs():
     """Read OpenClaw cron jobs"""
@@ -73,51 +27,26 @@ def read_cron_jobs():
 
 def process_agent_status(sessions_data):
     agents = []
-    current_time = datetime.now(timezone.utc).timestamp() * 1000
     
-    for session_id, session_info in sessions_data.items():
-        updated_at = session_info.get("updatedAt", 0)
-        time_diff = current_time - updated_at
-        
-        if time_diff < 5 * 60 * 1000:
-            status = "working"
-        elif time_diff < 30 * 60 * 1000:
-            status = "idle"
-        else:
-            status = "completed"
-        
-        task_name = session_info.get("currentTask", "Active session")
-        
+    for record in agent_records(sessions_data):
         agents.append({
-            "agent_name": session_id[:50],
-            "status": status,
-            "task_name": task_name,
+            "agent_name": record.session_key[:50],
+            "status": record.status,
+            "task_name": record.task_name,
         })
     
     return agents
 
 def process_cron_jobs(jobs_data):
     jobs = []
-    current_time = datetime.now(timezone.utc).timestamp() * 1000
     
-    for job in jobs_data.get("jobs", []):
-        state = job.get("state", {})
-        schedule = job.get("schedule", {})
-        
-        if not job.get("enabled", True):
-            status = "stopped"
-        elif state.get("lastStatus") == "ok":
-            next_run = state.get("nextRunAtMs", 0)
-            status = "pending" if next_run > current_time else "running"
-        else:
-            status = "failed"
-        
+    for record in cron_records(jobs_data):
         jobs.append({
-            "job_id": job.get("id", ""),
-            "name": job.get("name", ""),
-            "schedule": schedule.get("expr", ""),
-            "status": status,
-            "last_status": state.get("lastStatus", ""),
+            "job_id": record.job_id,
+            "name": record.name,
+            "schedule": record.schedule_expr,
+            "status": record.status,
+            "last_status": record.last_status,
         })
     
     return jobs
@@ -0,0 +1,103 @@
+"""
+🍃 Async Sync Engine
+Runs Supabase writes for several tables concurrently with one in-flight cap,
+so a slow response on one table no longer stalls the whole cycle
+"""
+
+import asyncio
+import json
+import time
+
+# ======== Configuration ========
+DEFAULT_MAX_IN_FLIGHT = 8
+DEFAULT_CHUNK_SIZE = 500
+TABLES = ("agent_status", "cron_jobs", "activity_log", "agent_status_history")
+
+def unique_rows(rows, on_conflict):
+    """Rows with one per `on_conflict` key, last wins: Postgres rejects a batch that touches a key twice"""
+    return list({row[on_conflict]: row for row in rows}.values())
+
+class AsyncSyncEngine:
+    """Per-table request queues drained by workers sharing one semaphore"""
+
+    def __init__(self, supabase, max_in_flight=DEFAULT_MAX_IN_FLIGHT, tables=TABLES):
+        self.supabase = supabase
+        self.max_in_flight = max_in_flight
+        self.tables = tables
+        self.queues = {}
+        self.workers = []
+        self.reset_stats()
+
+    def reset_stats(self):
+        self.stats = {"requests": 0, "errors": 0, "request_time": 0.0, "bytes_sent": 0}
+
+    # ======== Lifecycle ========
+    def start(self):
+        """Create the queues and workers (must run inside the event loop)"""
+        self.semaphore = asyncio.Semaphore(self.max_in_flight)
+        for table in self.tables:
+            self.queues[table] = asyncio.Queue()
+            # Enough workers that any one table can use the whole in-flight budget
+            for _ in range(self.max_in_flight):
+                self.workers.append(asyncio.create_task(self._worker(table)))
+
+    async def close(self):
+        """Cancel workers and fail anything still queued"""
+        for worker in self.workers:
+            worker.cancel()
+        await asyncio.gather(*self.workers, return_exceptions=True)
+        self.workers = []
+        for queue in self.queues.values():
+            while not queue.empty():
+                _, _, future = queue.get_nowait()
+                future.cancel()
+
+    async def _worker(self, table):
+        queue = self.queues[table]
+        while True:
+            request, payload_bytes, future = await queue.get()
+            try:
+                async with self.semaphore:
+                    started = time.perf_counter()
+                    error = None
+                    try:
+                        await asyncio.to_thread(request)
+                    except Exception as e:
+                        print(f"❌ Error writing to {table}: {e}")
+                        error = e
+                    self.stats["requests"] += 1
+                    self.stats["request_time"] += time.perf_counter() - started
+                    self.stats["bytes_sent"] += payload_bytes
+                    if error:
+                        self.stats["errors"] += 1
+                if not future.done():
+                    future.set_result(error)
+            finally:
+                queue.task_done()
+
+    def _submit(self, table, request, payload):
+        """Queue request(); the future resolves to None on success or to the exception"""
+        future = asyncio.get_running_loop().create_future()
+        payload_bytes = len(json.dumps(payload).encode('utf-8'))
+        self.queues[table].put_nowait((request, payload_bytes, future))
+        return future
+
+    # ======== Writes ========
+    async def upsert(self, table, rows, on_conflict, chunk_size=DEFAULT_CHUNK_SIZE):
+        """Queue chunked upserts; returns the rows that were written"""
+        rows = unique_rows(rows, on_conflict)
+        chunks = [rows[i:i + chunk_size] for i in range(0, len(rows), chunk_size)]
+        futures = [
+            self._submit(table, lambda chunk=chunk: self.supabase.table(table).upsert(chunk, on_conflict=on_conflict).execute(), chunk)
+            for chunk in chunks
+        ]
+        errors = await asyncio.gather(*futures)
+        return [row for chunk, error in zip(chunks, errors) if error is None for row in chunk]
+
+    async def insert(self, table, rows):
+        """Queue one insert request for a row or a list of rows (all or nothing); returns True on success"""
+        return await self._submit(table, lambda: self.supabase.table(table).insert(rows).execute(), rows) is None
+
+    async def call(self, table, request, payload):
+        """Queue any request against `table`; returns None on success or the exception it raised"""
+        return await self._submit(table, request, payload)
@@ -0,0 +1,119 @@
+"""
+🍃 Sync Outbox
+Local SQLite write-ahead outbox: row changes are stored first, shipped in
+acknowledged batches, and compacted so only the latest version per key waits
+"""
+
+import json
+import sqlite3
+import uuid
+from pathlib import Path
+
+# ======== Configuration ========
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024  # cap on queued row payloads
+PARKED_MAX_ROWS = 1000                # rejected rows kept for inspection
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS outbox (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    tbl TEXT NOT NULL,
+    key TEXT NOT NULL,
+    row TEXT NOT NULL,
+    UNIQUE (tbl, key)
+);
+CREATE INDEX IF NOT EXISTS idx_outbox_tbl_id ON outbox(tbl, id);
+CREATE TABLE IF NOT EXISTS outbox_parked (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    tbl TEXT NOT NULL,
+    key TEXT NOT NULL,
+    row TEXT NOT NULL,
+    error TEXT,
+    parked_at TEXT NOT NULL DEFAULT CURRENT_TIMESTAMP
+);
+"""
+
+class SyncOutbox:
+    """Durable, per-key compacted queue of rows waiting for Supabase"""
+
+    def __init__(self, path, max_bytes=DEFAULT_MAX_BYTES):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.db = sqlite3.connect(self.path)
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute("PRAGMA synchronous=NORMAL")
+        self.db.executescript(SCHEMA)
+
+    def close(self):
+        self.db.close()
+
+    # ======== Writes ========
+    def enqueue(self, table, rows, key_field=None):
+        """
+        Queue rows for `table`. Rows with a key replace any pending row with
+        the same key (only the net state is shipped); rows without a key
+        field (e.g. activity_log) are always appended. Returns the
+        (table, key) pairs the size cap dropped, which were never delivered.
+        """
+        records = []
+        for row in rows:
+            key = str(row[key_field]) if key_field else uuid.uuid4().hex
+            records.append((table, key, json.dumps(row)))
+        if not records:
+            return []
+
+        with self.db:
+            # REPLACE deletes the superseded row, so the new version also moves to the back
+            self.db.executemany("INSERT OR REPLACE INTO outbox (tbl, key, row) VALUES (?, ?, ?)", records)
+        return self._enforce_cap()
+
+    def _enforce_cap(self):
+        """Drop the oldest pending rows once queued payloads exceed max_bytes; returns their (table, key)"""
+        (size,) = self.db.execute("SELECT COALESCE(SUM(LENGTH(row)), 0) FROM outbox").fetchone()
+        if size <= self.max_bytes:
+            return []
+
+        dropped = []
+        with self.db:
+            for row_id, tbl, key, length in self.db.execute("SELECT id, tbl, key, LENGTH(row) FROM outbox ORDER BY id").fetchall():
+                if size <= self.max_bytes:
+                    break
+                self.db.execute("DELETE FROM outbox WHERE id = ?", (row_id,))
+                size -= length
+                dropped.append((tbl, key))
+        print(f"⚠️  Outbox over {self.max_bytes} bytes, dropped {len(dropped)} oldest rows")
+        return dropped
+
+    # ======== Draining ========
+    def peek(self, table, limit):
+        """Oldest pending rows for a table as [(id, row)]"""
+        cursor = self.db.execute("SELECT id, row FROM outbox WHERE tbl = ? ORDER BY id LIMIT ?", (table, limit))
+        return [(row_id, json.loads(row)) for row_id, row in cursor]
+
+    def ack(self, ids):
+        """Remove delivered rows. A row re-queued meanwhile has a new id and stays."""
+        with self.db:
+            self.db.executemany("DELETE FROM outbox WHERE id = ?", [(row_id,) for row_id in ids])
+
+    def park(self, row_id, error):
+        """Move a row the server rejected for good out of the queue, keeping the newest PARKED_MAX_ROWS"""
+        with self.db:
+            self.db.execute(
+                "INSERT INTO outbox_parked (tbl, key, row, error) SELECT tbl, key, row, ? FROM outbox WHERE id = ?",
+                (str(error), row_id),
+            )
+            self.db.execute("DELETE FROM outbox WHERE id = ?", (row_id,))
+            self.db.execute(
+                "DELETE FROM outbox_parked WHERE id <= (SELECT MAX(id) FROM outbox_parked) - ?",
+                (PARKED_MAX_ROWS,),
+            )
+
+    def tables(self):
+        """Tables that still have pending rows"""
+        return [t for (t,) in self.db.execute("SELECT DISTINCT tbl FROM outbox")]
+
+    def pending(self, table=None):
+        """Number of pending rows (optionally for one table)"""
+        if table:
+            return self.db.execute("SELECT COUNT(*) FROM outbox WHERE tbl = ?", (table,)).fetchone()[0]
+        return self.db.execute("SELECT COUNT(*) FROM outbox").fetchone()[0]
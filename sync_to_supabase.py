@@ -7,80 +7,31 @@ import json
 import os
 from pathlib import Path
 from datetime import datetime, timezone
-import urllib.request
-import urllib.parse
+from session_reader import read_sessions_data as read_session_files
+from office_records import agent_records, cron_records
+from supabase_transport import SupabaseTransport
 
 # ======== Configuration ========
 SUPABASE_URL = "https://czolesxhhfiwzubvbmab.supabase.co"
 SUPABASE_KEY = "sb_publishable_UB5d3pLNUYjX7eEryltBNg_S_4Tibew"
 OPENCLAW_SESSIONS_DIR = Path("/home/node/.openclaw/agents/main/sessions")
 OPENCLAW_CRON_DIR = Path("/home/node/.openclaw/cron")
+SUPABASE_POOL_SIZE = int(os.getenv("SUPABASE_POOL_SIZE", "4"))  # keep-alive connections / requests in flight
+SUPABASE_GZIP = os.getenv("SUPABASE_GZIP", "") == "1"  # gzip request bodies (needs a gateway that accepts them)
+UPSERT_PREFER = "resolution=merge-duplicates,return=minimal"
 
-def supabase_request(table, data, method="POST"):
-    """Simple Supabase REST API call"""
-    url = f"{SUPABASE_URL}/rest/v1/{table}"
-    headers = {
-        "apikey": SUPABASE_KEY,
-        "Authorization": f"Bearer {SUPABASE_KEY}",
-        "Content-Type": "application/json",
-        "Prefer": "return=minimal"
-    }
-    
-    data_bytes = json.dumps(data).encode('utf-8')
-    req = urllib.request.Request(url, data=data_bytes, headers=headers, method=method)
-    
-    try:
-        with urllib.request.urlopen(req, timeout=10) as response:
-            return response.status == 200 or response.status == 201
-    except Exception as e:
-        print(f"⚠️  Supabase error: {e}")
-        return False
+_transport = None
 
-def parse_timestamp(ts):
-    """Parse various timestamp formats"""
-    if not ts:
-        return datetime.now(timezone.utc).timestamp() * 1000
-    
-    if isinstance(ts, (int, float)):
-        return ts
-    
-    if isinstance(ts, str):
-        try:
-            if 'T' in ts:
-                dt = datetime.fromisoformat(ts.replace('Z', '+00:00'))
-                return dt.timestamp() * 1000
-            return float(ts) * 1000
-        except:
-            return datetime.now(timezone.utc).timestamp() * 1000
-    
-    return datetime.now(timezone.utc).timestamp() * 1000
+def get_transport():
+    """Shared keep-alive connection pool (created on first use)"""
+    global _transport
+    if _transport is None:
+        _transport = SupabaseTransport(SUPABASE_URL, SUPABASE_KEY, pool_size=SUPABASE_POOL_SIZE,
+                                       gzip_requests=SUPABASE_GZIP)
+    return _transport
 
 def read_sessions_data():
-    sessions = {}
-    
-    if not OPENCLAW_SESSIONS_DIR.exists():
-        return {}
-    
-    for f in OPENCLAW_SESSIONS_DIR.glob("*.jsonl"):
-        if ".deleted." in f.name or ".lock" in f.name:
-            continue
-        
-        try:
-            with open(f, 'r') as file:
-                lines = file.readlines()
-                if lines:
-                    last_line = json.loads(lines[-1])
-                    session_id = f.stem
-                    ts = parse_timestamp(last_line.get("timestamp"))
-                    sessions[session_id] = {
-                        "sessionId": session_id,
-                        "updatedAt": ts,
-                        "currentTask": last_line.get("content", "")[:100] if "content" in last_line else "Active session",
-                    }
-        except Exception as e:
-            print(f"⚠️  Error reading {f.name}: {e}")
-    
-    return sessions
+    return read_session_files(OPENCLAW_SESSIONS_DIR)
 
 def read_cron_jobs():
     jobs_file = OPENCLAW_CRON_DIR / "jobs.json"
@@ -92,25 +43,12 @@ def read_cron_jobs():
 
 def process_agent_status(sessions_data):
     agents = []
-    current_time = datetime.now(timezone.utc).timestamp() * 1000
     
-    for session_id, session_info in sessions_data.items():
-        updated_at = session_info.get("updatedAt", 0)
-        time_diff = current_time - updated_at
-        
-        if time_diff < 5 * 60 * 1000:
-            status = "working"
-        elif time_diff < 30 * 60 * 1000:
-            status = "idle"
-        else:
-            status = "completed"
-        
-        task_name = session_info.get("currentTask", "Active session")
-        
+    for record in agent_records(sessions_data):
         agents.append({
-            "agent_name": session_id[:50],
-            "status": status,
-            "task_name": task_name,
+            "agent_name": record.session_key[:50],
+            "status": record.status,
+            "task_name": record.task_name,
             "updated_at": datetime.now(timezone.utc).isoformat(),
         })
     
@@ -118,26 +56,14 @@ def process_agent_status(sessions_data):
 
 def process_cron_jobs(jobs_data):
     jobs = []
-    current_time = datetime.now(timezone.utc).timestamp() * 1000
     
-    for job in jobs_data.get("jobs", []):
-        state = job.get("state", {})
-        schedule = job.get("schedule", {})
-        
-        if not job.get("enabled", True):
-            status = "stopped"
-        elif state.get("lastStatus") == "ok":
-            next_run = state.get("nextRunAtMs", 0)
-            status = "pending" if next_run > current_time else "running"
-        else:
-            status = "failed"
-        
+    for record in cron_records(jobs_data):
         jobs.append({
-            "job_id": job.get("id", ""),
-            "name": job.get("name", ""),
-            "schedule": schedule.get("expr", ""),
-            "status": status,
-            "last_status": state.get("lastStatus", ""),
+            "job_id": record.job_id,
+            "name": record.name,
+            "schedule": record.schedule_expr,
+            "status": record.status,
+            "last_status": record.last_status,
             "updated_at": datetime.now(timezone.utc).isoformat(),
         })
     
@@ -146,16 +72,13 @@ def process_cron_jobs(jobs_data):
 def sync_to_supabase(agents, jobs):
     print("🔄 Syncing to Supabase...")
     
-    success = 0
-    for agent in agents:
-        if supabase_request("agent_status", agent):
-            success += 1
-    
-    for job in jobs:
-        if supabase_request("cron_jobs", job):
-            success += 1
+    transport = get_transport()
+    # agent_name / job_id are unique, so re-syncing a row updates it in place
+    success = sum(transport.insert_each("agent_status", agents, on_conflict="agent_name", prefer=UPSERT_PREFER))
+    success += sum(transport.insert_each("cron_jobs", jobs, on_conflict="job_id", prefer=UPSERT_PREFER))
     
     print(f"✅ Synced {success} records to Supabase!")
+    print(f"📡 {transport.stats['requests']} requests over {transport.stats['connections']} connections ({transport.stats['retries']} retries)")
     return success
 
 def main():